@@ -10,7 +10,7 @@ from typing import Optional
 import os
 
 # Import Supabase client
-from .supabase_client import supabase
+from .supabase_client import get_supabase
 
 
 async def get_current_user_id(authorization: Optional[str] = Header(None)) -> str:
@@ -57,7 +57,7 @@ async def get_current_user_id(authorization: Optional[str] = Header(None)) -> st
     # Validate JWT using Supabase client
     try:
         # Use Supabase client to validate token and get user
-        user_response = supabase.auth.get_user(token)
+        user_response = get_supabase().auth.get_user(token)
         
         if not user_response or not user_response.user:
             raise HTTPException(
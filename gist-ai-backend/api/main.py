@@ -4,6 +4,10 @@ from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from typing import List
 import asyncio
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 from .models import (
@@ -16,8 +20,35 @@ from .database import get_db_session, init_db
 from .websocket_manager import ws_manager
 from .pipeline_runner import run_pipeline_task
 from .auth import get_current_user_id
+from .supabase_client import get_supabase
+from .storage import get_r2, shutdown_r2
 from typing import Optional
 
+# Started by startup_event and stopped by shutdown_event (not at import time,
+# so importing the app in tests or scripts leaves logging untouched)
+_log_listener: Optional[QueueListener] = None
+
+
+def _start_logging() -> QueueListener:
+    """
+    Route log records through a queue to a listener thread writing to stderr
+    
+    Pipeline and storage modules log through `logging`; LOG_LEVEL=DEBUG/WARNING
+    retunes verbosity. The queue means a slow stdout consumer never blocks the
+    event loop.
+    """
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        handlers=[QueueHandler(log_queue)],
+        force=True  # Replace the handler left by a previous startup in this process
+    )
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Gist AI API",
@@ -37,8 +68,30 @@ app.add_middleware(
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
+    global _log_listener
+    if _log_listener is None:
+        _log_listener = _start_logging()
+    
     init_db()
     print("✓ Database initialized")
+    
+    # CRITICAL: Build the Supabase and R2 clients now so missing credentials
+    # stop the server at startup instead of failing the first request
+    get_supabase()
+    get_r2()
+    print("✓ Supabase and R2 clients initialized")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    global _log_listener
+    # Let in-flight R2 uploads finish, then release the upload pool threads
+    await asyncio.to_thread(shutdown_r2)
+    
+    # Stop logging last so the shutdown logs above are still written out
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
 
 
 @app.get("/")
@@ -296,9 +349,11 @@ async def websocket_endpoint(websocket: WebSocket, video_id: str):
             # Echo back for heartbeat
             await websocket.send_text(data)
     except WebSocketDisconnect:
-        await ws_manager.disconnect(video_id, websocket)
+        pass
     except Exception as e:
         print(f"WebSocket error: {e}")
+    finally:
+        # Connection snapshots hold strong references, so always deregister
         await ws_manager.disconnect(video_id, websocket)
 
 
@@ -321,7 +376,9 @@ async def list_projects(user_id: str = Depends(get_current_user_id)):
     """Get all projects for the authenticated user"""
     try:
         projects = ProjectRepository.get_user_projects(user_id)
-        return ProjectListResponse(projects=projects)
+        # Return plain data: response_model validates it once, instead of
+        # building ProjectListResponse here and validating it a second time
+        return {"projects": projects}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,7 +1,8 @@
 import sys
 import os
-import json
+import orjson
 import asyncio
+import logging
 from pathlib import Path
 from typing import Optional, Callable
 from datetime import datetime
@@ -14,7 +15,9 @@ from api.models import ProcessingStage, Video, Idea, TimeRangeSchema
 from api.database import get_db
 from api.websocket_manager import ws_manager
 from api.supabase_client import VideoRepository, IdeaRepository, SegmentRepository
-from api.storage import r2_storage
+from api.storage import get_r2
+
+logger = logging.getLogger(__name__)
 
 
 class PipelineRunner:
@@ -25,6 +28,8 @@ class PipelineRunner:
         self.youtube_url = youtube_url
         self.mode = mode
         self.output_dir = Path("output")
+        # Set once a FAILED status has been reported, so later events don't contradict it
+        self.failed = False
     
     @staticmethod
     def normalize_idea_data(idea_data: dict) -> dict:
@@ -62,8 +67,8 @@ class PipelineRunner:
             'total_duration_seconds': idea_data.get('total_duration_seconds', 0)
         }
         
-    async def update_video_status(self, stage: ProcessingStage, progress: int, message: str, error: Optional[str] = None):
-        """Update video status in database"""
+    def _write_sqlite_status(self, stage: ProcessingStage, progress: int, error: Optional[str] = None):
+        """Write video status to SQLite (blocking)"""
         with get_db() as db:
             video = db.query(Video).filter(Video.id == self.video_id).first()
             if video:
@@ -75,8 +80,9 @@ class PipelineRunner:
                     video.error_message = error
                     video.status = ProcessingStage.FAILED
                 db.commit()
-        
-        # Also update Supabase (dual-write)
+    
+    def _write_supabase_status(self, stage: ProcessingStage, progress: int, error: Optional[str] = None):
+        """Write video status to Supabase (blocking, best-effort)"""
         try:
             VideoRepository.update_processing_state(
                 self.video_id,
@@ -86,20 +92,23 @@ class PipelineRunner:
                 message=error if error else None
             )
         except Exception as e:
-            print(f"  ⚠ Warning: Supabase state update failed: {e}")
-        
-        # Broadcast via WebSocket
-        await ws_manager.send_progress(self.video_id, stage, progress, message)
+            logger.warning("  ⚠ Warning: Supabase state update failed: %s", e)
     
-    async def save_ideas_to_db(self, ideas_data: dict):
-        """Parse ideas JSON and save to database"""
+    async def update_video_status(self, stage: ProcessingStage, progress: int, message: str, error: Optional[str] = None):
+        """Update video status in database"""
+        if stage == ProcessingStage.FAILED:
+            self.failed = True
+        # SQLite write, Supabase dual-write and WebSocket broadcast are independent,
+        # so run them concurrently instead of paying for each round-trip in turn
+        await asyncio.gather(
+            asyncio.to_thread(self._write_sqlite_status, stage, progress, error),
+            asyncio.to_thread(self._write_supabase_status, stage, progress, error),
+            ws_manager.send_progress(self.video_id, stage, progress, message)
+        )
+    
+    def _save_ideas_to_sqlite(self, ideas_data: dict, user_id: str):
+        """Replace the video's ideas in SQLite (blocking)"""
         with get_db() as db:
-            video = db.query(Video).filter(Video.id == self.video_id).first()
-            if not video:
-                return
-            
-            user_id = video.user_id  # Get user_id from video for isolation
-            
             # Clear existing ideas
             db.query(Idea).filter(Idea.video_id == self.video_id).delete()
             
@@ -132,37 +141,41 @@ class PipelineRunner:
                 db.add(idea)
             
             db.commit()
-        
-        # Also save to Supabase (dual-write)
+    
+    def _save_ideas_to_supabase(self, ideas_data: dict, user_id: str):
+        """Replace the video's ideas and segments in Supabase (blocking, best-effort)"""
         try:
-            print(f"💾 Saving ideas to Supabase...")
+            logger.info("💾 Saving ideas to Supabase...")
             
             # Clear existing ideas in Supabase
             IdeaRepository.delete_ideas_for_video(self.video_id)
             
-            # Save new ideas and segments
-            for rank, idea_data in enumerate(ideas_data.get('ideas', []), 1):
+            # Insert all ideas in one request
+            ideas = ideas_data.get('ideas', [])
+            idea_rows = []
+            for rank, idea_data in enumerate(ideas, 1):
                 # Normalize data to ensure correct field mapping
                 normalized = self.normalize_idea_data(idea_data)
-                
-                # Create idea in Supabase
-                idea = IdeaRepository.create_idea(
-                    video_id=self.video_id,
-                    rank=rank,
-                    title=normalized['title'],
-                    description=normalized['description'],
-                    reason=normalized['reason'],  # Correctly mapped from 'reasoning'
-                    strength=normalized['strength'],
-                    viral_potential=normalized['viral_potential'],
-                    total_duration=normalized['total_duration_seconds'],
-                    segment_count=normalized['segment_count'],
-                    user_id=user_id  # User isolation
-                )
-                
-                idea_id = idea['id']
-                
-                # Create segments for this idea
-                segments = []
+                idea_rows.append({
+                    'video_id': self.video_id,
+                    'rank': rank,
+                    'title': normalized['title'],
+                    'description': normalized['description'],
+                    'reason': normalized['reason'],  # Correctly mapped from 'reasoning'
+                    'strength': normalized['strength'],
+                    'viral_potential': normalized['viral_potential'],
+                    'total_duration': normalized['total_duration_seconds'],
+                    'segment_count': normalized['segment_count'],
+                    'user_id': user_id  # User isolation
+                })
+            
+            created = IdeaRepository.bulk_create_ideas(idea_rows)
+            idea_ids_by_rank = {idea['rank']: idea['id'] for idea in created}
+            
+            # Insert the segments of every idea in one more request
+            segments = []
+            for rank, idea_data in enumerate(ideas, 1):
+                idea_id = idea_ids_by_rank[rank]
                 for idx, segment_data in enumerate(idea_data.get('segments', []), 1):
                     segments.append({
                         'idea_id': idea_id,
@@ -172,14 +185,120 @@ class PipelineRunner:
                         'sequence_order': idx,
                         'purpose': segment_data.get('purpose', '')
                     })
-                
-                if segments:
-                    SegmentRepository.bulk_create_segments(segments)
             
-            print(f"  ✓ Saved {len(ideas_data.get('ideas', []))} ideas to Supabase")
+            try:
+                SegmentRepository.bulk_create_segments(segments)
+            except Exception:
+                # Don't leave ideas without their segments behind
+                IdeaRepository.delete_ideas_for_video(self.video_id)
+                raise
+            
+            logger.info("  ✓ Saved %s ideas to Supabase", len(ideas))
             
         except Exception as e:
-            print(f"  ⚠ Warning: Supabase ideas save failed: {e}")
+            logger.warning("  ⚠ Warning: Supabase ideas save failed: %s", e)
+    
+    async def save_ideas_to_db(self, ideas_data: dict):
+        """Parse ideas JSON and save to database"""
+        with get_db() as db:
+            video = db.query(Video).filter(Video.id == self.video_id).first()
+            if not video:
+                return
+            
+            user_id = video.user_id  # Get user_id from video for isolation
+        
+        # SQLite and Supabase (dual-write) are independent stores - write both concurrently
+        await asyncio.gather(
+            asyncio.to_thread(self._save_ideas_to_sqlite, ideas_data, user_id),
+            asyncio.to_thread(self._save_ideas_to_supabase, ideas_data, user_id)
+        )
+    
+    def _upload_files_to_r2(self, transcript_data: dict, transcript_path: Path, video_path: Path, audio_path: Path):
+        """Upload local files to R2 and save their URLs to Supabase (blocking)"""
+        logger.info("📤 Uploading files to R2...")
+        
+        # Upload to R2 concurrently - CRITICAL: Abort on failure
+        uploads = [
+            (path, file_type)
+            for path, file_type in ((video_path, 'original'), (audio_path, 'audio'), (transcript_path, 'transcript'))
+            if path.exists()
+        ]
+        urls = get_r2().upload_video_files(
+            self.video_id,
+            [(str(path), file_type) for path, file_type in uploads]
+        )
+        
+        uploaded = {}
+        for (path, file_type), url in zip(uploads, urls):
+            label = 'video' if file_type == 'original' else file_type
+            if not url:
+                raise RuntimeError(f"Failed to upload {label} to R2 storage")
+            logger.info("  ✓ %s uploaded: %s", label.capitalize(), url)
+            uploaded[file_type] = url
+        
+        # Save URLs and metadata to Supabase in one round-trip
+        VideoRepository.update_many(
+            self.video_id,
+            original_video_url=uploaded.get('original'),
+            audio_file_url=uploaded.get('audio'),
+            transcript_url=uploaded.get('transcript'),
+            title=transcript_data.get('title', 'Unknown'),
+            duration=transcript_data.get('duration', 0),
+            language=transcript_data.get('language', 'en')
+        )
+        logger.info("  ✓ Metadata saved to Supabase")
+    
+    async def upload_files(self, transcript_data: dict, transcript_path: Path, video_path: Path, audio_path: Path):
+        """
+        Upload files to cloud storage, then tell the frontend the video is ready.
+        
+        Failures are raised, not reported: run() reports them once after joining
+        this task (see report_upload_failure).
+        """
+        await asyncio.to_thread(
+            self._upload_files_to_r2, transcript_data, transcript_path, video_path, audio_path
+        )
+        
+        # Don't announce a playable video for a pipeline that has already failed
+        if self.failed:
+            return
+        
+        # Emit video_ready event with metadata so frontend can load video immediately
+        await ws_manager.send_message(self.video_id, {
+            "type": "video_ready",
+            "video_id": self.video_id,
+            "title": transcript_data.get('title', 'Unknown'),
+            "duration": transcript_data.get('duration', 0),
+            "message": "Video is ready for playback"
+        })
+    
+    async def report_upload_failure(self, error: BaseException):
+        """Mark the video FAILED after a cloud storage upload error"""
+        # CRITICAL: Abort pipeline on upload failure
+        error_msg = str(error)
+        logger.error("❌ Cloud storage failed: %s", error_msg)
+        
+        # Update database with failure
+        await self.update_video_status(
+            ProcessingStage.FAILED,
+            0,
+            f"Upload failed: {error_msg}",
+            error=error_msg
+        )
+        
+        # Send WebSocket failure event
+        await ws_manager.send_message(self.video_id, {
+            "type": "upload_failed",
+            "video_id": self.video_id,
+            "error": "Failed to upload files to cloud storage. Please try again.",
+            "stage": "upload",
+            "technical_error": error_msg
+        })
+    
+    @staticmethod
+    def upload_failed(upload_task: asyncio.Task) -> bool:
+        """True once the background upload has finished with an error"""
+        return upload_task.done() and not upload_task.cancelled() and upload_task.exception() is not None
     
     async def run(self):
         """Run the pipeline with progress updates"""
@@ -195,7 +314,8 @@ class PipelineRunner:
                 "Downloading video and extracting audio..."
             )
             
-            pipeline = GistPipeline(mode=self.mode, skip_stitch=True)
+            # Ideas JSON is only read back by this runner, so skip pretty-printing
+            pipeline = GistPipeline(mode=self.mode, skip_stitch=True, compact_output=True)
             # CRITICAL: Run in thread pool to prevent blocking the event loop
             # This allows WebSocket messages to be sent during processing
             transcript_path, yt_id = await asyncio.to_thread(
@@ -217,6 +337,12 @@ class PipelineRunner:
                 )
                 return
             
+            # Parse the transcript once - metadata, uploads and cleanup all read from this dict
+            transcript_data = orjson.loads(transcript_path.read_bytes())
+            
+            video_path = Path(transcript_data.get('video_file_path', ''))
+            audio_path = transcript_path.parent / f"{yt_id}_audio.mp3"
+            
             # Update video metadata in SQLite
             with get_db() as db:
                 video = db.query(Video).filter(Video.id == self.video_id).first()
@@ -225,208 +351,164 @@ class PipelineRunner:
                     video.transcript_path = str(transcript_path)
                     
                     # Extract metadata from transcript
-                    with open(transcript_path, 'r') as f:
-                        transcript_data = json.load(f)
-                        video.title = transcript_data.get('title', 'Unknown')
-                        video.duration = transcript_data.get('duration', 0)
-                        video.video_path = transcript_data.get('video_path', '')
+                    video.title = transcript_data.get('title', 'Unknown')
+                    video.duration = transcript_data.get('duration', 0)
+                    video.video_path = transcript_data.get('video_path', '')
                     
                     db.commit()
             
-            # CLOUD STORAGE: Upload files to R2 and save to Supabase
+            # CLOUD STORAGE: Upload files to R2 in the background while the Brain runs.
+            # The Brain only reads the local transcript, so the two phases overlap
+            # and wall time is max(upload, brain) instead of the sum.
+            upload_task = asyncio.create_task(
+                self.upload_files(transcript_data, transcript_path, video_path, audio_path)
+            )
+            # Whether the upload outcome decides the pipeline: the Brain finished, or
+            # we stopped early because the upload failed (Brain errors report themselves)
+            upload_decides = False
+            
             try:
-                print(f"📤 Uploading files to R2...")
-                
-                # Get file paths from transcript data
-                with open(transcript_path, 'r') as f:
-                    transcript_data = json.load(f)
-                
-                video_path = Path(transcript_data.get('video_file_path', ''))
-                audio_path = transcript_path.parent / f"{yt_id}_audio.mp3"
-                
-                # Upload to R2 - CRITICAL: Abort on failure
-                video_url = None
-                audio_url = None
-                transcript_url = None
+                # Stop before any further stage if the upload has already failed
+                if self.upload_failed(upload_task):
+                    upload_decides = True
+                    return
                 
-                if video_path.exists():
-                    video_url = r2_storage.upload_video(self.video_id, str(video_path), 'original')
-                    if not video_url:
-                        raise RuntimeError("Failed to upload video to R2 storage")
-                    print(f"  ✓ Video uploaded: {video_url}")
-                
-                if audio_path.exists():
-                    audio_url = r2_storage.upload_video(self.video_id, str(audio_path), 'audio')
-                    if not audio_url:
-                        raise RuntimeError("Failed to upload audio to R2 storage")
-                    print(f"  ✓ Audio uploaded: {audio_url}")
-                
-                if transcript_path.exists():
-                    transcript_url = r2_storage.upload_video(self.video_id, str(transcript_path), 'transcript')
-                    if not transcript_url:
-                        raise RuntimeError("Failed to upload transcript to R2 storage")
-                    print(f"  ✓ Transcript uploaded: {transcript_url}")
-                
-                # Save to Supabase
-                VideoRepository.set_video_urls(
-                    self.video_id,
-                    original_url=video_url,
-                    audio_url=audio_url,
-                    transcript_url=transcript_url
+                # Stage 2: Transcription complete (already done in ingestion)
+                await self.update_video_status(
+                    ProcessingStage.TRANSCRIBING,
+                    30,
+                    "Transcription complete"
                 )
-                
-                VideoRepository.set_video_metadata(
+                await ws_manager.send_stage_complete(
                     self.video_id,
-                    title=transcript_data.get('title', 'Unknown'),
-                    duration=transcript_data.get('duration', 0),
-                    language=transcript_data.get('language', 'en')
+                    ProcessingStage.INGESTING,
+                    ProcessingStage.TRANSCRIBING
                 )
-                print(f"  ✓ Metadata saved to Supabase")
-                
-                # NOTE: Cleanup moved to end of pipeline (after Brain stage)
-                # Brain needs to read transcript.json, so we can't delete it yet
-                
-            except Exception as e:
-                # CRITICAL: Abort pipeline on upload failure
-                error_msg = str(e)
-                print(f"❌ Cloud storage failed: {error_msg}")
+            
+                if self.upload_failed(upload_task):
+                    upload_decides = True
+                    return
                 
-                # Update database with failure
+                # Stage 3: Understanding - Brain Stage 1 (Identifying Ideas)
                 await self.update_video_status(
-                    ProcessingStage.FAILED,
-                    0,
-                    f"Upload failed: {error_msg}",
-                    error=error_msg
+                    ProcessingStage.UNDERSTANDING,
+                    45,
+                    "Analyzing semantic content with AI..."
+                )
+                await ws_manager.send_stage_complete(
+                    self.video_id,
+                    ProcessingStage.TRANSCRIBING,
+                    ProcessingStage.UNDERSTANDING
                 )
-                
-                # Send WebSocket failure event
-                await ws_manager.send_message(self.video_id, {
-                    "type": "upload_failed",
-                    "video_id": self.video_id,
-                    "error": "Failed to upload files to cloud storage. Please try again.",
-                    "stage": "upload",
-                    "technical_error": error_msg
-                })
-                
-                raise  # Abort pipeline
-            
-            # Emit video_ready event with metadata so frontend can load video immediately
-            await ws_manager.send_message(self.video_id, {
-                "type": "video_ready",
-                "video_id": self.video_id,
-                "title": transcript_data.get('title', 'Unknown'),
-                "duration": transcript_data.get('duration', 0),
-                "message": "Video is ready for playback"
-            })
-            
-            # Stage 2: Transcription complete (already done in ingestion)
-            await self.update_video_status(
-                ProcessingStage.TRANSCRIBING,
-                30,
-                "Transcription complete"
-            )
-            await ws_manager.send_stage_complete(
-                self.video_id,
-                ProcessingStage.INGESTING,
-                ProcessingStage.TRANSCRIBING
-            )
-            
-            # Stage 3: Understanding - Brain Stage 1 (Identifying Ideas)
-            await self.update_video_status(
-                ProcessingStage.UNDERSTANDING,
-                45,
-                "Analyzing semantic content with AI..."
-            )
-            await ws_manager.send_stage_complete(
-                self.video_id,
-                ProcessingStage.TRANSCRIBING,
-                ProcessingStage.UNDERSTANDING
-            )
             
             
-            # Run brain processing (includes understanding, grouping, ranking)
-            # CRITICAL: Run in thread pool to prevent blocking the event loop
-            # Stage 2: Brain (Two-Stage Processing)
-            try:
-                ideas_path = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    pipeline.run_brain, transcript_path
-                )
-            except RuntimeError as e:
-                # Provider preflight failure
-                error_msg = str(e)
-                if "All providers failed preflight" in error_msg:
-                    print(f"\n❌ FATAL: {error_msg}")
+                # Don't spend LLM credits on a pipeline the upload has already doomed
+                if self.upload_failed(upload_task):
+                    upload_decides = True
+                    return
+                
+                # Run brain processing (includes understanding, grouping, ranking)
+                # CRITICAL: Run in thread pool to prevent blocking the event loop
+                # Stage 2: Brain (Two-Stage Processing)
+                try:
+                    ideas_path = await asyncio.get_event_loop().run_in_executor(
+                        None,
+                        pipeline.run_brain, transcript_path
+                    )
+                except RuntimeError as e:
+                    # Provider preflight failure
+                    error_msg = str(e)
+                    if "All providers failed preflight" in error_msg:
+                        logger.error("❌ FATAL: %s", error_msg)
+                    
+                        # Update database with failure
+                        await self.update_video_status(
+                            ProcessingStage.FAILED,
+                            0,
+                            "LLM provider unavailable - check API keys",
+                            error=error_msg
+                        )
                     
-                    # Update database with failure
+                        # Send WebSocket failure event
+                        await ws_manager.send_message(self.video_id, {
+                            "type": "provider_failed",
+                            "video_id": self.video_id,
+                            "error": "No LLM providers available. Please check your API keys in settings.",
+                            "stage": "brain_init",
+                            "technical_error": error_msg
+                        })
+                    
+                        return  # Abort pipeline
+                    else:
+                        # Other RuntimeError, re-raise
+                        raise
+                except ValueError as e:
+                    # Model validation error or configuration issue
+                    error_msg = str(e)
+                    logger.error("✗ Brain initialization error: %s", error_msg)
                     await self.update_video_status(
                         ProcessingStage.FAILED,
                         0,
-                        "LLM provider unavailable - check API keys",
+                        f"Invalid model configuration: {error_msg}",
                         error=error_msg
                     )
-                    
-                    # Send WebSocket failure event
-                    await ws_manager.send_message(self.video_id, {
-                        "type": "provider_failed",
-                        "video_id": self.video_id,
-                        "error": "No LLM providers available. Please check your API keys in settings.",
-                        "stage": "brain_init",
-                        "technical_error": error_msg
-                    })
-                    
-                    return  # Abort pipeline
-                else:
-                    # Other RuntimeError, re-raise
-                    raise
-            except ValueError as e:
-                # Model validation error or configuration issue
-                error_msg = str(e)
-                print(f"✗ Brain initialization error: {error_msg}")
-                await self.update_video_status(
-                    ProcessingStage.FAILED,
-                    0,
-                    f"Invalid model configuration: {error_msg}",
-                    error=error_msg
-                )
-                await ws_manager.send_error(
-                    self.video_id,
-                    ProcessingStage.UNDERSTANDING,
-                    "Model configuration error",
-                    error_msg
-                )
-                return
-            except Exception as e:
-                # Other Brain processing errors
-                error_msg = str(e)
-                print(f"✗ Brain processing error: {error_msg}")
-                await self.update_video_status(
-                    ProcessingStage.FAILED,
-                    0,
-                    f"Brain processing failed: {error_msg}",
-                    error=error_msg
-                )
-                await ws_manager.send_error(
-                    self.video_id,
-                    ProcessingStage.UNDERSTANDING,
-                    "Brain processing failed",
-                    error_msg
-                )
-                return
+                    await ws_manager.send_error(
+                        self.video_id,
+                        ProcessingStage.UNDERSTANDING,
+                        "Model configuration error",
+                        error_msg
+                    )
+                    return
+                except Exception as e:
+                    # Other Brain processing errors
+                    error_msg = str(e)
+                    logger.error("✗ Brain processing error: %s", error_msg)
+                    await self.update_video_status(
+                        ProcessingStage.FAILED,
+                        0,
+                        f"Brain processing failed: {error_msg}",
+                        error=error_msg
+                    )
+                    await ws_manager.send_error(
+                        self.video_id,
+                        ProcessingStage.UNDERSTANDING,
+                        "Brain processing failed",
+                        error_msg
+                    )
+                    return
             
-            if not ideas_path:
-                await self.update_video_status(
-                    ProcessingStage.FAILED,
-                    0,
-                    "No ideas could be generated from this video",
-                    error="Brain processing failed"
-                )
-                await ws_manager.send_error(
-                    self.video_id,
-                    ProcessingStage.RANKING,
-                    "No ideas generated",
-                    "Could not find usable ideas in this video"
-                )
+                if not ideas_path:
+                    await self.update_video_status(
+                        ProcessingStage.FAILED,
+                        0,
+                        "No ideas could be generated from this video",
+                        error="Brain processing failed"
+                    )
+                    await ws_manager.send_error(
+                        self.video_id,
+                        ProcessingStage.RANKING,
+                        "No ideas generated",
+                        "Could not find usable ideas in this video"
+                    )
+                    return
+                
+                upload_decides = True
+            finally:
+                # Never return (or clean up local files) while uploads are still reading them
+                upload_error = None
+                try:
+                    await upload_task
+                except Exception as e:
+                    upload_error = e
+                
+                # Report an upload failure exactly once, and never over a Brain error
+                if upload_error is not None:
+                    if upload_decides and not self.failed:
+                        await self.report_upload_failure(upload_error)
+                    else:
+                        logger.warning("  ⚠ Upload also failed: %s", upload_error)
+            
+            if upload_error is not None:
                 return
             
             # Brain processing complete - update remaining stages
@@ -462,36 +544,28 @@ class PipelineRunner:
                     db.commit()
             
             # Parse and save ideas
-            with open(ideas_path, 'r') as f:
-                ideas_data = json.load(f)
+            ideas_data = orjson.loads(Path(ideas_path).read_bytes())
             
             await self.save_ideas_to_db(ideas_data)
             
             # Stage 6: Cleanup local files (after all stages that need them)
-            print(f"🗑️  Cleaning up local files...")
+            logger.info("🗑️  Cleaning up local files...")
             try:
-                # Get file paths from transcript
-                with open(transcript_path, 'r') as f:
-                    transcript_data = json.load(f)
-                
-                video_path = Path(transcript_data.get('video_file_path', ''))
-                audio_path = transcript_path.parent / f"{yt_id}_audio.mp3"
-                
                 if video_path.exists():
                     video_path.unlink()
-                    print(f"  ✓ Deleted local video: {video_path.name}")
+                    logger.info("  ✓ Deleted local video: %s", video_path.name)
                 
                 if audio_path.exists():
                     audio_path.unlink()
-                    print(f"  ✓ Deleted local audio: {audio_path.name}")
+                    logger.info("  ✓ Deleted local audio: %s", audio_path.name)
                 
                 if transcript_path.exists():
                     transcript_path.unlink()
-                    print(f"  ✓ Deleted local transcript: {transcript_path.name}")
+                    logger.info("  ✓ Deleted local transcript: %s", transcript_path.name)
                 
-                print(f"  ✓ Local files cleaned up")
+                logger.info("  ✓ Local files cleaned up")
             except Exception as cleanup_error:
-                print(f"  ⚠ Warning: File cleanup failed: {cleanup_error}")
+                logger.warning("  ⚠ Warning: File cleanup failed: %s", cleanup_error)
                 # Don't fail the pipeline if cleanup fails
             
             # Stage 7: Complete (Atomic)
@@ -505,9 +579,9 @@ class PipelineRunner:
             # 2. Mark complete in Supabase (atomic: status + progress + timestamp)
             try:
                 VideoRepository.mark_completed(self.video_id)
-                print(f"✓ Marked video {self.video_id} as COMPLETE in Supabase")
+                logger.info("✓ Marked video %s as COMPLETE in Supabase", self.video_id)
             except Exception as e:
-                print(f"⚠ Warning: Supabase completion update failed: {e}")
+                logger.warning("⚠ Warning: Supabase completion update failed: %s", e)
             
             # 3. Send WebSocket completion event
             await ws_manager.send_complete(
@@ -527,13 +601,13 @@ class PipelineRunner:
                             status='ready',
                             ideas_count=ideas_data.get('ideas_count', 0)
                         )
-                        print(f"✓ Updated project {video.project_id} to READY with {ideas_data.get('ideas_count', 0)} ideas")
+                        logger.info("✓ Updated project %s to READY with %s ideas", video.project_id, ideas_data.get('ideas_count', 0))
             except Exception as e:
-                print(f"⚠ Warning: Project status update failed: {e}")
+                logger.warning("⚠ Warning: Project status update failed: %s", e)
                 # Don't fail pipeline if project update fails
             
         except Exception as e:
-            print(f"Pipeline error: {str(e)}")
+            logger.error("Pipeline error: %s", e)
             await self.update_video_status(
                 ProcessingStage.FAILED,
                 0,
@@ -579,10 +653,10 @@ async def run_pipeline_task(video_id: str, youtube_url: str, mode: str = "local"
             self._save_ideas_to_db(mock_data)
             
             self._update_state('COMPLETE', 100, 'Processing complete!')
-            print('✅ Mock pipeline complete - ideas saved to database')
+            logger.info('✅ Mock pipeline complete - ideas saved to database')
             
         except Exception as e:
-            print(f'Mock pipeline error: {e}')
+            logger.error('Mock pipeline error: %s', e)
             self._update_state('FAILED', 0, f'Mock processing failed: {str(e)}')
             raise
 
@@ -2,16 +2,20 @@
 Project-related Pydantic models
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 
 class ProjectCreate(BaseModel):
     """Request model for creating a project"""
+    model_config = ConfigDict(frozen=True)
+    
     title: str
 
 
 class ProjectResponse(BaseModel):
     """Response model for a project"""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     title: str
     video_url: Optional[str] = None
@@ -23,4 +27,6 @@ class ProjectResponse(BaseModel):
 
 class ProjectListResponse(BaseModel):
     """Response model for list of projects"""
+    model_config = ConfigDict(frozen=True)
+    
     projects: List[ProjectResponse]
@@ -2,7 +2,20 @@
 Repository for project database operations
 """
 
-from api.supabase_client import supabase
+import threading
+import time
+from collections import OrderedDict
+
+from api.supabase_client import get_supabase
+
+# Short-lived cache for get_project (project_id -> (expires_at, row)), kept in
+# insertion order so the oldest entry is also the next one to expire.
+# Bounded staleness: entries expire after PROJECT_CACHE_TTL seconds and are
+# dropped immediately on update/delete from this process.
+PROJECT_CACHE_TTL = 5
+PROJECT_CACHE_MAX_SIZE = 1024
+_project_cache = OrderedDict()
+_project_cache_lock = threading.Lock()
 
 
 class ProjectRepository:
@@ -17,31 +30,60 @@ class ProjectRepository:
             'status': 'pending',
             **kwargs
         }
-        result = supabase.table('projects').insert(data).execute()
+        result = get_supabase().table('projects').insert(data).execute()
         return result.data[0] if result.data else None
     
     @staticmethod
     def get_project(project_id: str):
-        """Get a project by ID"""
-        result = supabase.table('projects').select('*').eq('id', project_id).execute()
-        return result.data[0] if result.data else None
+        """
+        Get a project by ID (served from a short TTL cache when possible)
+        
+        The cache is per process: update_project/delete_project invalidate it
+        here, but other workers can keep serving the old row for up to
+        PROJECT_CACHE_TTL seconds. Callers get their own copy of the row.
+        """
+        now = time.monotonic()
+        with _project_cache_lock:
+            cached = _project_cache.get(project_id)
+            if cached and cached[0] > now:
+                return dict(cached[1])
+        
+        result = get_supabase().table('projects').select('*').eq('id', project_id).execute()
+        project = result.data[0] if result.data else None
+        
+        if project:
+            with _project_cache_lock:
+                _project_cache.pop(project_id, None)
+                while len(_project_cache) >= PROJECT_CACHE_MAX_SIZE:
+                    _project_cache.popitem(last=False)
+                _project_cache[project_id] = (now + PROJECT_CACHE_TTL, dict(project))
+        return project
+    
+    @staticmethod
+    def invalidate_project(project_id: str):
+        """Drop a project from the get_project cache"""
+        with _project_cache_lock:
+            _project_cache.pop(project_id, None)
     
     @staticmethod
     def get_user_projects(user_id: str, limit: int = 50):
         """Get all projects for a user, sorted by updated_at desc"""
-        result = supabase.table('projects').select('*').eq('user_id', user_id).order('updated_at', desc=True).limit(limit).execute()
+        result = get_supabase().table('projects').select('*').eq('user_id', user_id).order('updated_at', desc=True).limit(limit).execute()
         return result.data
     
     @staticmethod
     def update_project(project_id: str, **kwargs):
         """Update a project"""
-        result = supabase.table('projects').update(kwargs).eq('id', project_id).execute()
+        result = get_supabase().table('projects').update(kwargs).eq('id', project_id).execute()
+        # Invalidate after the write so a concurrent get_project can't re-cache the old row
+        ProjectRepository.invalidate_project(project_id)
         return result.data[0] if result.data else None
     
     @staticmethod
     def delete_project(project_id: str):
         """Delete a project"""
-        supabase.table('projects').delete().eq('id', project_id).execute()
+        get_supabase().table('projects').delete().eq('id', project_id).execute()
+        ProjectRepository.invalidate_project(project_id)
     
     @staticmethod
     def update_project_status(project_id: str, status: str):
@@ -50,8 +92,13 @@ class ProjectRepository:
 
     @staticmethod
     def get_project_details(project_id: str):
-        """Get project with ALL related data (videos, ideas, segments)"""
-        from api.supabase_client import VideoRepository, IdeaRepository
+        """
+        Get project with ALL related data (videos, ideas, segments)
+        
+        Each idea carries its segments under idea['segments'], ordered by
+        sequence_order (an empty list when it has none).
+        """
+        from api.supabase_client import VideoRepository, IdeaRepository, SegmentRepository
         
         # Get project
         project = ProjectRepository.get_project(project_id)
@@ -61,11 +108,16 @@ class ProjectRepository:
         # Get ALL videos for this project
         videos = VideoRepository.get_videos_by_project(project_id)
         
-        # Get ideas for ALL videos
+        # Get ideas for ALL videos in one request (avoids one query per video)
+        ideas_by_video = IdeaRepository.get_ideas_for_videos([video['id'] for video in videos])
         all_ideas = []
         for video in videos:
-            ideas = IdeaRepository.get_ideas_for_video(video['id'])
-            all_ideas.extend(ideas)
+            all_ideas.extend(ideas_by_video.get(video['id'], []))
+        
+        # Attach segments to each idea, again in a single request
+        segments_by_idea = SegmentRepository.get_segments_for_ideas([idea['id'] for idea in all_ideas])
+        for idea in all_ideas:
+            idea['segments'] = segments_by_idea.get(idea['id'], [])
         
         return {
             'project': project,
@@ -3,16 +3,39 @@ Supabase client and repository classes for database operations
 """
 
 import os
+from collections import defaultdict
+from functools import lru_cache
+from postgrest.exceptions import APIError
 from supabase import create_client, Client
 
-# Initialize Supabase client
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+__all__ = ["get_supabase", "VideoRepository", "IdeaRepository", "SegmentRepository"]
 
-if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
-    raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+@lru_cache(maxsize=1)
+def get_supabase() -> Client:
+    """
+    Get the shared Supabase client, creating it on first use
+    
+    Deferring construction keeps env validation and client setup out of
+    import time (worker cold starts, scripts that never touch Supabase).
+    
+    Raises:
+        ValueError: If SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY is not set
+    """
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_service_role_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    
+    if not supabase_url or not supabase_service_role_key:
+        raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set")
+    
+    return create_client(supabase_url, supabase_service_role_key)
+
+
+def __getattr__(name):
+    # Backward compatibility: `from api.supabase_client import supabase`
+    if name == 'supabase':
+        return get_supabase()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class VideoRepository:
@@ -53,7 +76,7 @@ class VideoRepository:
         if video_id:
             data['id'] = video_id
         
-        result = supabase.table('videos').insert(data).execute()
+        result = get_supabase().table('videos').insert(data).execute()
         return result.data[0] if result.data else None
     
     @staticmethod
@@ -68,46 +91,48 @@ class VideoRepository:
         if message:
             data['error_message'] = message
         
-        result = supabase.table('videos').update(data).eq('id', video_id).execute()
+        result = get_supabase().table('videos').update(data).eq('id', video_id).execute()
         return result.data[0] if result.data else None
     
     @staticmethod
     def get_videos_by_project(project_id: str):
         """Get all videos for a project"""
-        result = supabase.table('videos').select('*').eq('project_id', project_id).execute()
+        result = get_supabase().table('videos').select('*').eq('project_id', project_id).execute()
         return result.data if result.data else []
     
+    @staticmethod
+    def update_many(video_id: str, **fields):
+        """
+        Update several video columns in a single request
+        
+        Fields set to None are skipped, so callers can pass everything
+        they have and let one PATCH carry it.
+        """
+        data = {key: value for key, value in fields.items() if value is not None}
+        if not data:
+            return None
+        result = get_supabase().table('videos').update(data).eq('id', video_id).execute()
+        return result.data[0] if result.data else None
+    
     @staticmethod
     def set_video_urls(video_id: str, original_url: str = None, audio_url: str = None, transcript_url: str = None):
         """Set video file URLs"""
-        data = {}
-        if original_url:
-            data['original_video_url'] = original_url
-        if audio_url:
-            data['audio_file_url'] = audio_url
-        if transcript_url:
-            data['transcript_url'] = transcript_url
-        
-        if data:
-            result = supabase.table('videos').update(data).eq('id', video_id).execute()
-            return result.data[0] if result.data else None
-        return None
+        return VideoRepository.update_many(
+            video_id,
+            original_video_url=original_url or None,
+            audio_file_url=audio_url or None,
+            transcript_url=transcript_url or None
+        )
     
     @staticmethod
     def set_video_metadata(video_id: str, title: str = None, duration: float = None, language: str = None):
         """Set video metadata"""
-        data = {}
-        if title:
-            data['title'] = title
-        if duration is not None:
-            data['duration'] = duration
-        if language:
-            data['language'] = language
-        
-        if data:
-            result = supabase.table('videos').update(data).eq('id', video_id).execute()
-            return result.data[0] if result.data else None
-        return None
+        return VideoRepository.update_many(
+            video_id,
+            title=title or None,
+            duration=duration,
+            language=language or None
+        )
     
     @staticmethod
     def mark_completed(video_id: str):
@@ -118,7 +143,7 @@ class VideoRepository:
             'progress': 100,
             'completed_at': datetime.utcnow().isoformat()
         }
-        result = supabase.table('videos').update(data).eq('id', video_id).execute()
+        result = get_supabase().table('videos').update(data).eq('id', video_id).execute()
         return result.data[0] if result.data else None
 
 
@@ -134,20 +159,39 @@ class IdeaRepository:
             'title': title,
             **kwargs
         }
-        result = supabase.table('ideas').insert(data).execute()
+        result = get_supabase().table('ideas').insert(data).execute()
         return result.data[0] if result.data else None
     
+    @staticmethod
+    def bulk_create_ideas(ideas: list):
+        """Bulk create ideas"""
+        if not ideas:
+            return []
+        result = get_supabase().table('ideas').insert(ideas).execute()
+        return result.data if result.data else []
+    
     @staticmethod
     def delete_ideas_for_video(video_id: str):
         """Delete all ideas for a video (cascades to segments via ON DELETE CASCADE)"""
-        result = supabase.table('ideas').delete().eq('video_id', video_id).execute()
+        result = get_supabase().table('ideas').delete().eq('video_id', video_id).execute()
         return result
     
     @staticmethod
     def get_ideas_for_video(video_id: str):
         """Get all ideas for a video"""
-        result = supabase.table('ideas').select('*').eq('video_id', video_id).order('rank').execute()
+        result = get_supabase().table('ideas').select('*').eq('video_id', video_id).order('rank').execute()
         return result.data if result.data else []
+    
+    @staticmethod
+    def get_ideas_for_videos(video_ids: list):
+        """Get all ideas for several videos in one request, grouped by video_id"""
+        ideas_by_video = defaultdict(list)
+        if not video_ids:
+            return ideas_by_video
+        result = get_supabase().table('ideas').select('*').in_('video_id', video_ids).order('rank').execute()
+        for idea in result.data or []:
+            ideas_by_video[idea['video_id']].append(idea)
+        return ideas_by_video
 
 
 class SegmentRepository:
@@ -164,13 +208,36 @@ class SegmentRepository:
             'sequence_order': sequence_order,
             **kwargs
         }
-        result = supabase.table('segments').insert(data).execute()
+        result = get_supabase().table('segments').insert(data).execute()
         return result.data[0] if result.data else None
     
     @staticmethod
     def bulk_create_segments(segments: list):
-        """Bulk create segments"""
+        """
+        Bulk create segments
+        
+        Uses the create_segments_bulk function (migrations/006) so Postgres runs
+        one INSERT ... SELECT over the whole payload. Falls back to a plain
+        multi-row insert when that migration hasn't been applied yet.
+        """
         if not segments:
             return []
-        result = supabase.table('segments').insert(segments).execute()
+        try:
+            result = get_supabase().rpc('create_segments_bulk', {'payload': segments}).execute()
+        except APIError as e:
+            # PGRST202: PostgREST can't find the function (migration 006 not deployed)
+            if e.code != 'PGRST202':
+                raise
+            result = get_supabase().table('segments').insert(segments).execute()
         return result.data if result.data else []
+    
+    @staticmethod
+    def get_segments_for_ideas(idea_ids: list):
+        """Get all segments for several ideas in one request, grouped by idea_id"""
+        segments_by_idea = defaultdict(list)
+        if not idea_ids:
+            return segments_by_idea
+        result = get_supabase().table('segments').select('*').in_('idea_id', idea_ids).order('sequence_order').execute()
+        for segment in result.data or []:
+            segments_by_idea[segment['idea_id']].append(segment)
+        return segments_by_idea
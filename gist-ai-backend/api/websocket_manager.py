@@ -1,79 +1,150 @@
-from typing import Dict, Set
+from dataclasses import dataclass
+from typing import Dict, Tuple
 from fastapi import WebSocket
-import json
 import asyncio
-from datetime import datetime
+import logging
+import orjson
+import time
+
+logger = logging.getLogger(__name__)
+
+# How long progress updates are coalesced before being flushed as one frame
+PROGRESS_FLUSH_INTERVAL = 0.02
+
+# Number of lock shards; a video_id always maps to the same shard
+LOCK_SHARDS = 16
+
+
+@dataclass
+class ProgressEvent:
+    """
+    Queued progress update. Slotted to keep per-update allocations small;
+    orjson serializes dataclass instances natively.
+    """
+    __slots__ = ("type", "stage", "progress", "message", "timestamp")
+    type: str
+    stage: str
+    progress: int
+    message: str
+    timestamp: int
 
 
 class WebSocketManager:
     """Manages WebSocket connections for video processing updates"""
     
     def __init__(self):
-        # video_id -> set of WebSocket connections
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
-        self._lock = asyncio.Lock()
+        # video_id -> immutable tuple of WebSocket connections. connect/disconnect
+        # swap in a new tuple (copy-on-write), so broadcast can iterate the
+        # current snapshot without copying it.
+        self.active_connections: Dict[str, Tuple[WebSocket, ...]] = {}
+        # Sharded locks: connect/disconnect for one video never waits on another
+        self._locks = [asyncio.Lock() for _ in range(LOCK_SHARDS)]
+        # video_id -> stage -> latest pending progress event (coalesced per stage)
+        self._pending: Dict[str, Dict[str, ProgressEvent]] = {}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+    
+    def _lock_for(self, video_id: str) -> asyncio.Lock:
+        """Return the lock shard guarding a video's connection set"""
+        return self._locks[hash(video_id) % LOCK_SHARDS]
     
     async def connect(self, video_id: str, websocket: WebSocket):
         """Accept and register a new WebSocket connection"""
         await websocket.accept()
-        async with self._lock:
-            if video_id not in self.active_connections:
-                self.active_connections[video_id] = set()
-            self.active_connections[video_id].add(websocket)
-        print(f"WebSocket connected for video {video_id}. Total connections: {len(self.active_connections[video_id])}")
+        async with self._lock_for(video_id):
+            self.active_connections[video_id] = (*self.active_connections.get(video_id, ()), websocket)
+        logger.info("WebSocket connected for video %s. Total connections: %s", video_id, len(self.active_connections.get(video_id, ())))
     
     async def disconnect(self, video_id: str, websocket: WebSocket):
         """Remove a WebSocket connection"""
-        async with self._lock:
-            if video_id in self.active_connections:
-                self.active_connections[video_id].discard(websocket)
-                if not self.active_connections[video_id]:
-                    del self.active_connections[video_id]
-        print(f"WebSocket disconnected for video {video_id}")
+        async with self._lock_for(video_id):
+            self._remove_connections(video_id, {websocket})
+        logger.info("WebSocket disconnected for video %s", video_id)
+    
+    def _remove_connections(self, video_id: str, websockets: set):
+        """Swap in a snapshot without the given sockets (caller holds the video's lock)"""
+        remaining = tuple(ws for ws in self.active_connections.get(video_id, ()) if ws not in websockets)
+        if remaining:
+            self.active_connections[video_id] = remaining
+        else:
+            self.active_connections.pop(video_id, None)
     
     async def broadcast(self, video_id: str, message: dict):
         """Broadcast a message to all connections for a video"""
-        if video_id not in self.active_connections:
+        websockets = self.active_connections.get(video_id)
+        if not websockets:
             return
         
-        # Add timestamp if not present
+        # Add timestamp if not present (epoch milliseconds; cheaper than an ISO string)
         if "timestamp" not in message:
-            message["timestamp"] = datetime.utcnow().isoformat()
+            message["timestamp"] = time.time_ns() // 1_000_000
         
-        message_json = json.dumps(message)
+        # Serialize and UTF-8 encode once; every connection gets the same frame bytes
+        payload = orjson.dumps(message)
+        
+        # Send to the snapshot concurrently WITHOUT holding the lock: a slow or
+        # backpressured client only delays its own send, not the others.
+        results = await asyncio.gather(
+            *(websocket.send_bytes(payload) for websocket in websockets),
+            return_exceptions=True
+        )
         
-        # Send to all active connections (iterate over a copy to avoid set modification during iteration)
         disconnected = set()
-        for websocket in list(self.active_connections[video_id]):
-            try:
-                await websocket.send_text(message_json)
-            except Exception as e:
-                print(f"Error sending to WebSocket: {e}")
+        for websocket, result in zip(websockets, results):
+            if isinstance(result, Exception):
+                logger.warning("Error sending to WebSocket: %s", result)
                 disconnected.add(websocket)
         
         # Clean up disconnected websockets
         if disconnected:
-            async with self._lock:
-                self.active_connections[video_id] -= disconnected
-                if not self.active_connections[video_id]:
-                    del self.active_connections[video_id]
+            async with self._lock_for(video_id):
+                self._remove_connections(video_id, disconnected)
     
     async def send_progress(self, video_id: str, stage: str, progress: int, message: str):
-        """Send progress update to all connections for a video"""
-        await self.broadcast(video_id, {
-            "type": "progress",
-            "stage": stage,
-            "progress": progress,
-            "message": message
-        })
+        """
+        Queue a progress update for all connections for a video.
+        
+        Updates are coalesced for PROGRESS_FLUSH_INTERVAL and sent as a single
+        {"type": "batch", "events": [...]} frame; only the latest event per
+        stage survives the window.
+        """
+        if video_id not in self.active_connections:
+            return
+        
+        self._pending.setdefault(video_id, {})[stage] = ProgressEvent(
+            "progress", stage, progress, message, time.time_ns() // 1_000_000
+        )
+        if video_id not in self._flush_tasks:
+            self._flush_tasks[video_id] = asyncio.create_task(
+                self._flush_after(video_id, PROGRESS_FLUSH_INTERVAL)
+            )
+    
+    async def _flush_after(self, video_id: str, delay: float):
+        """Flush pending progress for a video once the coalescing window closes"""
+        await asyncio.sleep(delay)
+        self._flush_tasks.pop(video_id, None)
+        await self._flush_progress(video_id)
+    
+    async def _flush_progress(self, video_id: str):
+        """Send any pending progress events for a video as one batch frame"""
+        batch = self._pending.pop(video_id, None)
+        if batch:
+            await self.broadcast(video_id, {"type": "batch", "events": list(batch.values())})
+    
+    async def _send_ordered(self, video_id: str, message: dict):
+        """Flush queued progress first so non-progress messages never overtake it"""
+        task = self._flush_tasks.pop(video_id, None)
+        if task:
+            task.cancel()
+        await self._flush_progress(video_id)
+        await self.broadcast(video_id, message)
     
     async def send_message(self, video_id: str, message: dict):
         """Send custom message to all connections for a video"""
-        await self.broadcast(video_id, message)
+        await self._send_ordered(video_id, message)
     
     async def send_stage_complete(self, video_id: str, current_stage: str, next_stage: str):
         """Send stage completion notification"""
-        await self.broadcast(video_id, {
+        await self._send_ordered(video_id, {
             "type": "stage_complete",
             "current_stage": current_stage,
             "next_stage": next_stage
@@ -81,7 +152,7 @@ class WebSocketManager:
     
     async def send_complete(self, video_id: str, ideas_count: int):
         """Send processing completion notification"""
-        await self.broadcast(video_id, {
+        await self._send_ordered(video_id, {
             "type": "complete",
             "message": f"Processing complete! {ideas_count} ideas generated.",
             "ideas_count": ideas_count
@@ -89,7 +160,7 @@ class WebSocketManager:
     
     async def send_error(self, video_id: str, stage: str, error: str, details: str):
         """Send error notification"""
-        await self.broadcast(video_id, {
+        await self._send_ordered(video_id, {
             "type": "error",
             "stage": stage,
             "error": error,
@@ -6,14 +6,193 @@ Stage 2: Find all segments for each idea
 Uses provider-based LLM architecture (OpenRouter primary, Groq fallback)
 """
 
+import asyncio
 import json
+import logging
+import re
+import time
+import types
+from functools import lru_cache
 from pathlib import Path
 import os
+import orjson
 from dotenv import load_dotenv
 
+from .prompt_cache import PromptCache
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Word tokens and common English stopwords for the Stage 2 keyword pre-filter
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been but by can could
+did do does for from had has have he her his how i if in into is it its just
+like more most my no not of on one only or our out over she so some than that
+the their them then there these they this to up us very was we were what when
+where which who why will with would you your
+""".split())
+
+
+# Sampling temperature of every Brain LLM call (also part of the prompt cache key)
+LLM_TEMPERATURE = 0.3
+
+
+def _content_words(text):
+    """Lowercased non-stopword tokens of 3+ characters"""
+    return {word for word in _WORD_RE.findall(text.lower()) if len(word) >= 3 and word not in _STOPWORDS}
+
+
+# Markdown code fences, or a trailing comma before a closing brace/bracket
+# (e.g. `[1, 2,]`); clean_json_string() drops fences and keeps the closer
+_JSON_CLEANUP = re.compile(r'```(?:json)?|,\s*([}\]])')
+
+# Static Stage 2 prompt sections (part of the cached prefix)
+STAGE2_SEGMENTATION_RULES = """CRITICAL SEGMENTATION RULES:
+1. MINIMUM segment duration: 15 seconds (not 2-10 seconds)
+2. Only create a new segment when there's a CLEAR BREAK in the narrative
+3. If someone is explaining one continuous point, keep it as ONE segment
+4. If segments would be adjacent or very close (within 5 seconds), MERGE them into one
+5. Target: 1-4 segments total (not 5-10+)
+6. Total duration across all segments: 30-90 seconds"""
+
+STAGE2_OUTPUT_FORMAT = """OUTPUT FORMAT (JSON):
+{
+  "segments": [
+    {"start": "MM:SS", "end": "MM:SS", "purpose": "What this segment contributes (hook/development/resolution)"}
+  ],
+  "reasoning": "Explain how these segments connect to form the complete idea.",
+  "transcript_excerpt": "Key quotes that show the hook and resolution"
+}"""
+
+STAGE2_BATCH_OUTPUT_FORMAT = """OUTPUT FORMAT (JSON) - one entry per idea, idea_index matching the number in IDEAS TO FIND:
+{
+  "results": [
+    {
+      "idea_index": 0,
+      "segments": [
+        {"start": "MM:SS", "end": "MM:SS", "purpose": "What this segment contributes (hook/development/resolution)"}
+      ],
+      "reasoning": "Explain how these segments connect to form the complete idea.",
+      "transcript_excerpt": "Key quotes that show the hook and resolution"
+    }
+  ]
+}"""
+
+STAGE2_REQUIREMENTS = """STRICT REQUIREMENTS:
+- Each segment MUST be at least 15 seconds
+- If the idea needs more than 4 segments or 90 seconds total, it's too broad
+- Merge adjacent or near-adjacent segments
+
+CRITICAL JSON RULES:
+- Output ONLY valid JSON (no markdown, no explanation)
+- Do NOT escape apostrophes: use ' not \'
+- Use only standard JSON escapes: \" \\ \/ \b \f \n \r \t
+- No trailing commas
+- Invalid JSON will be DISCARDED without retry (wastes credits)
+
+IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure all strings are properly quoted and escaped."""
+
+STAGE2_STRICT_RULES = "\n\n".join([
+    "Your task: Find ALL segments needed to tell the ONE specific story described under IDEA TO FIND below.",
+    STAGE2_SEGMENTATION_RULES,
+    STAGE2_OUTPUT_FORMAT,
+    STAGE2_REQUIREMENTS,
+])
+
+STAGE2_BATCH_RULES = "\n\n".join([
+    "Your task: For EACH idea listed under IDEAS TO FIND below, find ALL segments needed to tell "
+    "that ONE specific story. Treat every idea independently; segments may overlap between ideas.",
+    STAGE2_SEGMENTATION_RULES,
+    STAGE2_BATCH_OUTPUT_FORMAT,
+    STAGE2_REQUIREMENTS,
+])
+
+
+@lru_cache(maxsize=4096)
+def _format_mmss(seconds):
+    """Format whole seconds as MM:SS (memoized; transcripts repeat seconds often)"""
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+class _JsonStreamCollector:
+    """
+    Accumulates streamed LLM text and reports when the first top-level JSON
+    object is closed, so the caller can stop reading trailing output.
+    """
+    
+    def __init__(self):
+        self.parts = []
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text):
+        """Append a chunk; return True once the top-level object is complete"""
+        self.parts.append(text)
+        return self.scan(text) != -1
+    
+    def scan(self, text, start=0):
+        """
+        Advance the brace/string state over text[start:].
+        
+        Returns:
+            int: Index in text of the brace closing the top-level object, or -1
+        """
+        for i in range(start, len(text)):
+            ch = text[i]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '{':
+                self.depth += 1
+                self.started = True
+            elif not self.started:
+                # Ignore any preamble (quotes included) before the JSON starts
+                continue
+            elif ch == '"':
+                self.in_string = True
+            elif ch == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    return i
+        return -1
+    
+    def text(self):
+        return "".join(self.parts)
+
+
+class _RequestPacer:
+    """
+    Async requests-per-minute limiter (GCRA-style token bucket).
+    
+    Lets `burst` requests start back to back, then spaces the rest 60/rpm
+    seconds apart, so a fan-out of Stage 2 calls stays under the provider's
+    RPM quota instead of tripping 429s and retry backoff. Keeps no asyncio
+    primitives, so one pacer can serve successive event loops.
+    """
+    
+    def __init__(self, rpm, burst=1):
+        self.interval = 60.0 / rpm
+        self.tolerance = (max(burst, 1) - 1) * self.interval
+        self._tat = 0.0  # theoretical arrival time of the next request
+    
+    async def wait(self):
+        """Sleep until the next request may start, reserving its slot"""
+        now = time.monotonic()
+        tat = max(self._tat, now)
+        delay = tat - self.tolerance - now
+        self._tat = tat + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
 
 class Brain:
     """
@@ -26,7 +205,11 @@ class Brain:
     Public API:
         __init__(provider=None) - Initialize with LLM provider
         process(transcript_path) - Run full two-stage pipeline
+        process_async(transcript_path) - Same, awaitable from an event loop
+                                         (use `async with brain:` to close pooled connections)
+        aclose() - Close provider connections and the prompt cache
         save_output(ideas_data, output_dir="output") - Save results to JSON
+        save_output_compact(ideas_data, output_dir="output") - Same, without indentation
         
     Internal methods (used by process):
         stage1_identify_ideas(formatted_transcript) - Stage 1 processing
@@ -35,13 +218,15 @@ class Brain:
         generate(prompt, temperature=0.3) - Alias for query_llm
     """
     
-    def __init__(self, provider=None):
+    def __init__(self, provider=None, stage2_batch_api=False):
         """
         Initialize Brain with an LLM provider.
         
         Args:
             provider: LLMProvider instance (from providers.py)
                      If None, will auto-select from available providers
+            stage2_batch_api: Send Stage 2 through the provider's offline Batch API
+                     (waits up to the batch window; only for offline CLI runs)
         """
         if provider is None:
             # Auto-select provider if not provided
@@ -50,7 +235,11 @@ class Brain:
             provider = ProviderFactory.select_provider_with_preflight(providers)
         
         self.provider = provider
-        print(f"Brain initialized with provider: {self.provider.name()} ({self.provider.get_model_name()})")
+        # Exact-match LLM response cache (None unless BRAIN_CACHE_PATH is set)
+        self.cache = PromptCache.from_env()
+        # (formatted_transcript, prompt prefix) for the transcript being processed
+        self._stage2_prefix_cache = None
+        logger.info("Brain initialized with provider: %s (%s)", self.provider.name(), self.provider.get_model_name())
         
         # Brain runtime invariants (fixed configuration):
         # - Strict mode only (no permissive/local mode)
@@ -70,21 +259,54 @@ class Brain:
         self.max_segments = 5  # Maximum segments per idea
         self.min_avg_segment = 15  # Minimum average segment duration
         
+        # Transcript line merging for prompts (see _merge_short_segments)
+        self.transcript_line_min_chars = 80  # Close a merged line once it is this long
+        self.transcript_line_max_span = 10.0  # Max seconds one [MM:SS] line may cover
+        
+        # Stage 2 strategy: per-idea calls (at most stage2_concurrency in flight);
+        # BRAIN_STAGE2_BATCHED=1 tries one call for all ideas first and only
+        # falls back to per-idea calls for ideas missing from its reply
+        self.batch_stage2 = os.getenv("BRAIN_STAGE2_BATCHED", "0") == "1"
+        self.stage2_concurrency = 8
+        # Requests-per-minute cap on async LLM calls, e.g. 30 for Groq's free tier (0 = unlimited)
+        self.llm_rpm = int(os.getenv("BRAIN_LLM_RPM", "0"))
+        self._llm_pacer = (
+            _RequestPacer(self.llm_rpm, burst=min(self.stage2_concurrency, self.llm_rpm))
+            if self.llm_rpm > 0 else None
+        )
+        # Ideas sharing fewer content words with the transcript skip Stage 2 (0 disables)
+        self.min_keyword_overlap = int(os.getenv("BRAIN_MIN_KEYWORD_OVERLAP", "0"))
+        # Reuse the Stage 2 segments of a previously seen idea on the same transcript
+        # whose title/description word-set similarity reaches this value (0 disables)
+        self.semantic_cache_threshold = float(os.getenv("BRAIN_SEMANTIC_CACHE_THRESHOLD", "0"))
+        # Send per-idea Stage 2 requests through the provider's discounted offline
+        # Batch API when it has one (waits for the batch; opt-in per run, never
+        # for interactive API requests)
+        self.stage2_batch_api = stage2_batch_api
+        # Give up on (and cancel) a Stage 2 batch that hasn't finished after this many seconds
+        self.stage2_batch_max_wait = float(os.getenv("BRAIN_STAGE2_BATCH_MAX_WAIT", "3600"))
+        # Ask providers for JSON mode (response_format json_object); every Brain prompt expects one JSON object
+        self.json_mode = os.getenv("BRAIN_JSON_MODE", "1") != "0"
+        
         # Sanity check: Ensure all required attributes are set
         assert hasattr(self, 'provider'), "Brain must have provider"
         assert hasattr(self, 'min_segment_duration'), "Brain must have min_segment_duration"
         assert hasattr(self, 'max_segment_duration'), "Brain must have max_segment_duration"
+        
+        # Thresholds are fixed after __init__; snapshot them once for the
+        # per-segment/per-idea validation loops (attribute access, no dict rebuild)
+        self._thresholds = types.SimpleNamespace(**self.get_validation_thresholds())
 
 
     
     def load_transcript(self, transcript_path):
         """Load transcript JSON from ingestion output"""
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(transcript_path, 'rb') as f:
+            data = orjson.loads(f.read())
         
-        print(f"Loaded transcript: {transcript_path}")
-        print(f"Duration: {data['duration']:.1f}s")
-        print(f"Segments: {len(data['segments'])}")
+        logger.info("Loaded transcript: %s", transcript_path)
+        logger.info("Duration: %.1fs", data['duration'])
+        logger.info("Segments: %s", len(data['segments']))
         
         return data
     
@@ -93,20 +315,55 @@ class Brain:
         Convert transcript JSON to readable text with timestamps
         Format: [00:00] Text here
         """
-        formatted_lines = []
+        return "\n".join(
+            f"[{_format_mmss(int(start))}] {text}"
+            for start, text in self._merge_short_segments(
+                transcript_data['segments'],
+                min_chars=self.transcript_line_min_chars,
+                max_span=self.transcript_line_max_span
+            )
+        )
+    
+    def _merge_short_segments(self, segments, min_chars, max_span):
+        """
+        Merge consecutive short ASR fragments into sentence-sized lines.
         
-        for segment in transcript_data['segments']:
-            timestamp = self._format_timestamp(segment['start'])
-            text = segment['text']
-            formatted_lines.append(f"[{timestamp}] {text}")
+        A line is closed at sentence punctuation or once it reaches min_chars;
+        fragments are never merged past max_span seconds (measured to each
+        fragment's end), so MM:SS anchors stay precise relative to the 15s
+        minimum segment length. A single fragment longer than max_span
+        stays on its own line.
+        Cuts transcript tokens for every Stage 1/Stage 2 prompt.
         
-        return "\n".join(formatted_lines)
+        Yields:
+            tuple: (start_seconds, text) for each merged line
+        """
+        start = None
+        parts = []
+        length = 0
+        
+        for segment in segments:
+            text = segment['text'].strip()
+            if not text:
+                continue
+            # Close on the fragment's end, so a line never covers more than max_span
+            if parts and segment['end'] - start > max_span:
+                yield start, " ".join(parts)
+                parts, length = [], 0
+            if not parts:
+                start = segment['start']
+            parts.append(text)
+            length += len(text)
+            if length >= min_chars or text[-1] in '.?!':
+                yield start, " ".join(parts)
+                parts, length = [], 0
+        
+        if parts:
+            yield start, " ".join(parts)
     
     def _format_timestamp(self, seconds):
         """Convert seconds to MM:SS format"""
-        mins = int(seconds // 60)
-        secs = int(seconds % 60)
-        return f"{mins:02d}:{secs:02d}"
+        return _format_mmss(int(seconds))
     
     def get_validation_thresholds(self):
         """Get validation thresholds (uses instance attributes set in __init__)"""
@@ -242,54 +499,49 @@ Output ONLY valid JSON, no extra text."""
         """
         return self.build_stage2_prompt_strict(formatted_transcript, idea_title, idea_description)
     
+    def _stage2_strict_prefix(self, formatted_transcript):
+        """
+        Invariant Stage 2 prompt prefix (instructions + transcript + rules),
+        built once per transcript and reused for every idea.
+        """
+        cached = self._stage2_prefix_cache
+        if cached is None or cached[0] is not formatted_transcript:
+            prefix = (
+                "You are a video editor finding ALL moments that contribute to a specific idea.\n\n"
+                "TRANSCRIPT:\n" + formatted_transcript + "\n\n"
+                + STAGE2_STRICT_RULES + "\n\n"
+            )
+            cached = self._stage2_prefix_cache = (formatted_transcript, prefix)
+        return cached[1]
+    
     def build_stage2_prompt_strict(self, formatted_transcript, idea_title, idea_description):
         """
         STAGE 2 (STRICT): For Groq/OpenRouter - Precise segmentation
+        
+        Everything except the trailing idea block is byte-identical across the
+        ideas of one video, so providers with prompt (KV prefix) caching only
+        prefill the transcript once.
         """
-        prompt = f"""You are a video editor finding ALL moments that contribute to a specific idea.
-
-IDEA TO FIND:
-Title: {idea_title}
-Description: {idea_description}
-
-TRANSCRIPT:
-{formatted_transcript}
-
-Your task: Find ALL segments needed to tell this ONE specific story.
-
-CRITICAL SEGMENTATION RULES:
-1. MINIMUM segment duration: 15 seconds (not 2-10 seconds)
-2. Only create a new segment when there's a CLEAR BREAK in the narrative
-3. If someone is explaining one continuous point, keep it as ONE segment
-4. If segments would be adjacent or very close (within 5 seconds), MERGE them into one
-5. Target: 1-4 segments total (not 5-10+)
-6. Total duration across all segments: 30-90 seconds
-
-OUTPUT FORMAT (JSON):
-{{
-  "segments": [
-    {{"start": "MM:SS", "end": "MM:SS", "purpose": "What this segment contributes (hook/development/resolution)"}}
-  ],
-  "reasoning": "Explain how these segments connect to form the complete idea.",
-  "transcript_excerpt": "Key quotes that show the hook and resolution"
-}}
-
-STRICT REQUIREMENTS:
-- Each segment MUST be at least 15 seconds
-- If the idea needs more than 4 segments or 90 seconds total, it's too broad
-- Merge adjacent or near-adjacent segments
-
-CRITICAL JSON RULES:
-- Output ONLY valid JSON (no markdown, no explanation)
-- Do NOT escape apostrophes: use ' not \'
-- Use only standard JSON escapes: \" \\ \/ \b \f \n \r \t
-- No trailing commas
-- Invalid JSON will be DISCARDED without retry (wastes credits)
-
-IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure all strings are properly quoted and escaped."""
-
-
-        return prompt
+        return (
+            self._stage2_strict_prefix(formatted_transcript)
+            + f"IDEA TO FIND:\nTitle: {idea_title}\nDescription: {idea_description}"
+        )
+    
+    def build_stage2_batch_prompt(self, formatted_transcript, ideas_list):
+        """
+        STAGE 2 (BATCHED): Find segments for every idea in one call, so the
+        transcript is sent and prefilled once per video instead of once per idea.
+        """
+        ideas_block = "\n".join(
+            f"[{index}] Title: {idea['title']}\n    Description: {idea['description']}"
+            for index, idea in enumerate(ideas_list)
+        )
+        return (
+            "You are a video editor finding ALL moments that contribute to each of several ideas.\n\n"
+            "TRANSCRIPT:\n" + formatted_transcript + "\n\n"
+            + STAGE2_BATCH_RULES + "\n\n"
+            + "IDEAS TO FIND:\n" + ideas_block
+        )
     
     def build_stage2_prompt_permissive(self, formatted_transcript, idea_title, idea_description):
         """
@@ -333,7 +585,7 @@ IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure a
 
         return prompt
     
-    def generate(self, prompt, temperature=0.3):
+    def generate(self, prompt, temperature=LLM_TEMPERATURE):
         """
         Generate LLM response using configured provider.
         
@@ -344,13 +596,38 @@ IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure a
         Returns:
             str: LLM response text
         """
+        model = self.provider.get_model_name()
+        if self.cache is not None:
+            cached = self.cache.get(model, temperature, prompt)
+            if cached is not None:
+                logger.info("  ⚡ Prompt cache hit (%s)", model)
+                return cached
+        
+        # Stream the response and stop as soon as the JSON object is complete
+        collector = _JsonStreamCollector()
+        complete = False
         try:
-            return self.provider.query(prompt, temperature=temperature)
+            chunks = self.provider.stream(prompt, temperature=temperature, json_mode=self.json_mode)
+            try:
+                for chunk in chunks:
+                    if collector.feed(chunk):
+                        complete = True
+                        break
+            finally:
+                chunks.close()
+            response = collector.text()
         except Exception as e:
-            print(f"❌ Provider {self.provider.name()} failed: {e}")
+            logger.error("❌ Provider %s failed: %s", self.provider.name(), e)
+            self._forget_preflight()
             raise
+        
+        # Only cache responses containing a complete JSON object, so a
+        # truncated/garbled reply isn't replayed on every rerun
+        if complete and self.cache is not None:
+            self.cache.set(model, temperature, prompt, response)
+        return response
 
-    def query_llm(self, prompt, temperature=0.3):
+    def query_llm(self, prompt, temperature=LLM_TEMPERATURE):
         """
         Query LLM (alias for generate, for backward compatibility).
         
@@ -363,6 +640,53 @@ IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure a
         """
         return self.generate(prompt, temperature)
     
+    async def agenerate(self, prompt, temperature=LLM_TEMPERATURE):
+        """
+        Async counterpart of generate() so Stage 2 calls can run concurrently.
+        
+        Args:
+            prompt: Text prompt to send to LLM
+            temperature: Sampling temperature (0.0-1.0)
+        
+        Returns:
+            str: LLM response text
+        """
+        model = self.provider.get_model_name()
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, model, temperature, prompt)
+            if cached is not None:
+                logger.info("  ⚡ Prompt cache hit (%s)", model)
+                return cached
+        
+        if self._llm_pacer is not None:
+            await self._llm_pacer.wait()
+        
+        collector = _JsonStreamCollector()
+        complete = False
+        try:
+            chunks = self.provider.astream(prompt, temperature=temperature, json_mode=self.json_mode)
+            try:
+                async for chunk in chunks:
+                    if collector.feed(chunk):
+                        complete = True
+                        break
+            finally:
+                await chunks.aclose()
+            response = collector.text()
+        except Exception as e:
+            logger.error("❌ Provider %s failed: %s", self.provider.name(), e)
+            await asyncio.to_thread(self._forget_preflight)
+            raise
+        
+        if complete and self.cache is not None:
+            await asyncio.to_thread(self.cache.set, model, temperature, prompt, response)
+        return response
+    
+    def _forget_preflight(self):
+        """A failing provider's cached preflight pass is stale; don't let a restart trust it"""
+        from .providers import ProviderFactory
+        ProviderFactory.forget_preflight(self.provider)
+    
     def sanitize_llm_json(self, text: str) -> str:
         """
         Sanitize common LLM JSON errors before parsing.
@@ -376,36 +700,46 @@ IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure a
     
     def clean_json_string(self, json_str):
         """Clean common JSON formatting issues from LLM output"""
-        # Remove markdown code blocks
-        json_str = json_str.replace('```json', '').replace('```', '')
-        
-        # Remove trailing commas before closing braces/brackets
-        import re
-        json_str = re.sub(r',\s*}', '}', json_str)
-        json_str = re.sub(r',\s*]', ']', json_str)
-        
-        return json_str.strip()
+        # Remove markdown code blocks and trailing commas in a single pass
+        return _JSON_CLEANUP.sub(lambda m: m.group(1) or '', json_str).strip()
 
     def parse_llm_response(self, response_text):
         """
         Extract and parse JSON from LLM response.
         Uses extract_and_parse_json which includes sanitization.
         """
-        return self.extract_and_parse_json(response_text)
+        # JSON mode replies are a bare object; only fall back to extraction
+        # for providers/routes that ignored response_format
+        try:
+            data = orjson.loads(response_text)
+        except orjson.JSONDecodeError:
+            return self.extract_and_parse_json(response_text)
+        if not isinstance(data, dict):
+            return self.extract_and_parse_json(response_text)
+        return data
     
     def extract_and_parse_json(self, response_text):
         """
         Extract and parse JSON from LLM response.
         Tries multiple strategies to handle common LLM formatting issues.
         """
-        # Find JSON boundaries
+        # Find JSON boundaries: first '{' to its balanced closing '}', so stray
+        # braces in trailing prose don't end up in the slice
         start_idx = response_text.find('{')
-        end_idx = response_text.rfind('}') + 1
-        
-        if start_idx == -1 or end_idx == 0:
-            print(f"\nRaw response: {response_text}")
+        if start_idx == -1:
+            logger.error("Raw response: %s", response_text)
             raise ValueError("No JSON found in LLM response")
         
+        close_idx = _JsonStreamCollector().scan(response_text, start_idx)
+        if close_idx != -1:
+            end_idx = close_idx + 1
+        else:
+            # Unbalanced (e.g. truncated) - fall back to the last closing brace
+            end_idx = response_text.rfind('}') + 1
+            if end_idx == 0:
+                logger.error("Raw response: %s", response_text)
+                raise ValueError("No JSON found in LLM response")
+        
         json_str = response_text[start_idx:end_idx]
         
         # Sanitize first (fix illegal escapes)
@@ -421,32 +755,28 @@ IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure a
         for strategy_name, strategy_func in strategies:
             try:
                 processed_json = strategy_func(json_str)
-                data = json.loads(processed_json)
+                data = orjson.loads(processed_json)
                 if strategy_name != "Direct parsing":
-                    print(f"✓ Successfully parsed using: {strategy_name}")
+                    logger.info("✓ Successfully parsed using: %s", strategy_name)
                 return data
             except json.JSONDecodeError as e:
                 last_error = e
                 continue
         
         # All strategies failed - show detailed error
-        print(f"\n{'='*60}")
-        print(f"❌ FAILED TO PARSE JSON (tried all strategies)")
-        print(f"{'='*60}")
-        print(f"Final error: {last_error}")
-        print(f"\nProblematic JSON (first 500 chars):")
-        print(json_str[:500])
-        print(f"\nFull raw response:")
-        print(response_text)
-        print(f"{'='*60}\n")
+        logger.error(
+            "❌ FAILED TO PARSE JSON (tried all strategies)\n"
+            "Final error: %s\n"
+            "Problematic JSON (first 500 chars):\n%s\n"
+            "Full raw response:\n%s",
+            last_error, json_str[:500], response_text
+        )
         raise RuntimeError(f"Failed to parse LLM JSON response: {str(last_error)}")
     
     def convert_timestamp_to_seconds(self, timestamp_str):
         """Convert MM:SS to seconds"""
-        parts = timestamp_str.split(':')
-        mins = int(parts[0])
-        secs = int(parts[1])
-        return mins * 60 + secs
+        mins, _, secs = timestamp_str.partition(':')
+        return int(mins) * 60 + int(secs)
     
     def run_stage1(self, formatted_transcript):
         """
@@ -454,34 +784,55 @@ IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure a
         Returns: List of idea titles and descriptions
         UPDATED: Better error handling
         """
-        print("\n=== STAGE 1: Identifying complete ideas ===")
-        print("  🔒 STRICT MODE: Selective filtering, 3-10 ideas expected")
-        print("  → Analyzing video content...")
+        logger.info("=== STAGE 1: Identifying complete ideas ===")
+        logger.info("  🔒 STRICT MODE: Selective filtering, 3-10 ideas expected")
+        logger.info("  → Analyzing video content...")
         
         try:
             prompt = self.build_stage1_prompt(formatted_transcript)
             response = self.query_llm(prompt)
-            ideas_list = self.parse_llm_response(response)
-            
-            num_ideas = len(ideas_list.get('ideas', []))
-            
-            if num_ideas == 0:
-                print("  ⚠ No complete ideas identified")
-            else:
-                print(f"  ✓ Found {num_ideas} complete ideas")
+            return self._parse_stage1_response(response)
             
-            return ideas_list.get('ideas', [])
+        except Exception as e:
+            raise RuntimeError(f"Stage 1 failed: {str(e)}")
+    
+    async def run_stage1_async(self, formatted_transcript):
+        """
+        Async variant of run_stage1(); prompt building and parsing run in a
+        worker thread so the event loop stays free.
+        """
+        logger.info("=== STAGE 1: Identifying complete ideas ===")
+        logger.info("  🔒 STRICT MODE: Selective filtering, 3-10 ideas expected")
+        logger.info("  → Analyzing video content...")
+        
+        try:
+            prompt = await asyncio.to_thread(self.build_stage1_prompt, formatted_transcript)
+            response = await self.agenerate(prompt)
+            return await asyncio.to_thread(self._parse_stage1_response, response)
             
         except Exception as e:
             raise RuntimeError(f"Stage 1 failed: {str(e)}")
     
+    def _parse_stage1_response(self, response):
+        """Parse a Stage 1 LLM response into the list of ideas"""
+        ideas_list = self.parse_llm_response(response)
+        
+        num_ideas = len(ideas_list.get('ideas', []))
+        
+        if num_ideas == 0:
+            logger.warning("  ⚠ No complete ideas identified")
+        else:
+            logger.info("  ✓ Found %s complete ideas", num_ideas)
+        
+        return ideas_list.get('ideas', [])
+    
     def run_stage2(self, formatted_transcript, idea):
         """
         STAGE 2: Find all segments for one specific idea
         Returns: Segments with timestamps
         UPDATED: No-retry guard for JSON failures
         """
-        print(f"  → Finding segments for: '{idea['title']}'")
+        logger.info("  → Finding segments for: '%s'", idea['title'])
         
         try:
             prompt = self.build_stage2_prompt(
@@ -491,33 +842,250 @@ IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure a
             )
             
             response = self.query_llm(prompt)
+            return self._parse_stage2_response(response)
             
-            # Parse with sanitization (no retry on failure)
-            try:
-                segments_data = self.parse_llm_response(response)
-            except (json.JSONDecodeError, ValueError) as e:
-                # CRITICAL: Do NOT retry - this wastes credits
-                print(f"    ✗ JSON parse failed: {str(e)}")
-                print(f"    Raw response (first 300 chars): {response[:300]}...")
-                raise RuntimeError(f"Invalid JSON from LLM (no retry)")
-            
-            # Validate required keys
-            if 'segments' not in segments_data or 'reasoning' not in segments_data:
-                print(f"    ⚠️  Missing required keys (segments/reasoning)")
-                raise RuntimeError(f"Incomplete JSON response")
-            
-            num_segments = len(segments_data.get('segments', []))
-            print(f"    ✓ Found {num_segments} segments")
+        except RuntimeError:
+            # Re-raise RuntimeError (JSON failures)
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Stage 2 failed for '{idea['title']}': {str(e)}")
+    
+    async def run_stage2_async(self, formatted_transcript, idea):
+        """
+        Async variant of run_stage2() with identical error semantics.
+        """
+        logger.info("  → Finding segments for: '%s'", idea['title'])
+        
+        try:
+            prompt = self.build_stage2_prompt(
+                formatted_transcript,
+                idea['title'],
+                idea['description']
+            )
             
-            return segments_data
+            response = await self.agenerate(prompt)
+            return self._parse_stage2_response(response)
             
         except RuntimeError:
-            # Re-raise RuntimeError (JSON failures)
             raise
         except Exception as e:
             raise RuntimeError(f"Stage 2 failed for '{idea['title']}': {str(e)}")
+    
+    async def run_stage2_all(self, formatted_transcript, ideas_list):
+        """
+        Run Stage 2 for every idea concurrently, at most stage2_concurrency
+        calls in flight at once.
+        
+        Returns:
+            list: One entry per idea, in input order - either the segments
+                  dict or the exception raised for that idea
+        """
+        semaphore = asyncio.Semaphore(self.stage2_concurrency)
+        
+        async def bounded(idea):
+            async with semaphore:
+                return await self.run_stage2_async(formatted_transcript, idea)
+        
+        return await asyncio.gather(
+            *(bounded(idea) for idea in ideas_list),
+            return_exceptions=True
+        )
+    
+    async def run_stage2_batch_async(self, formatted_transcript, ideas_list):
+        """
+        Run Stage 2 for all ideas as a single LLM call.
+        
+        Returns:
+            dict: idea index -> segments dict, for every result that passed
+                  validation (ideas missing from the reply are absent)
+        
+        Raises:
+            RuntimeError: If the call fails or the reply isn't usable JSON
+        """
+        logger.info("  → Finding segments for %s ideas in one batched call", len(ideas_list))
+        
+        try:
+            prompt = await asyncio.to_thread(self.build_stage2_batch_prompt, formatted_transcript, ideas_list)
+            response = await self.agenerate(prompt)
+            data = await asyncio.to_thread(self.parse_llm_response, response)
+        except Exception as e:
+            raise RuntimeError(f"Batched Stage 2 failed: {str(e)}")
+        
+        results = data.get('results') if isinstance(data, dict) else None
+        if not isinstance(results, list):
+            raise RuntimeError("Incomplete JSON response (missing results)")
+        
+        by_index = {}
+        for result in results:
+            if not isinstance(result, dict):
+                continue
+            index = result.get('idea_index')
+            if (
+                isinstance(index, int) and 0 <= index < len(ideas_list)
+                and 'segments' in result and 'reasoning' in result
+            ):
+                by_index[index] = result
+        
+        logger.info("    ✓ Batched call returned segments for %s/%s ideas", len(by_index), len(ideas_list))
+        return by_index
+    
+    async def run_stage2_batch_api(self, formatted_transcript, ideas_list):
+        """
+        Run Stage 2 through the provider's offline Batch API: one request per
+        idea, billed at the batch rate and collected once the batch completes.
+        
+        Returns:
+            dict: idea index -> segments dict, for every request that succeeded
+                  and parsed (failed ideas are absent, so callers retry them)
+        
+        Raises:
+            RuntimeError: If the batch as a whole fails or runs past stage2_batch_max_wait
+        """
+        logger.info("  → Submitting %s Stage 2 requests to the %s Batch API", len(ideas_list), self.provider.name())
+        
+        prompts = [
+            self.build_stage2_prompt(formatted_transcript, idea['title'], idea['description'])
+            for idea in ideas_list
+        ]
+        try:
+            responses = await asyncio.to_thread(
+                self.provider.query_batch, prompts,
+                temperature=LLM_TEMPERATURE,
+                max_wait=self.stage2_batch_max_wait,
+                json_mode=self.json_mode
+            )
+        except Exception as e:
+            raise RuntimeError(f"Stage 2 batch job failed: {str(e)}")
+        
+        model = self.provider.get_model_name()
+        by_index = {}
+        for index, (idea, prompt, response) in enumerate(zip(ideas_list, prompts, responses)):
+            if response is None:
+                logger.warning("    ⚠ Batch request failed for '%s'", idea['title'])
+                continue
+            try:
+                by_index[index] = self._parse_stage2_response(response)
+            except RuntimeError:
+                continue
+            # Same prompt and temperature as the real-time path, so later runs hit the prompt cache
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.set, model, LLM_TEMPERATURE, prompt, response)
+        
+        logger.info("    ✓ Batch API returned segments for %s/%s ideas", len(by_index), len(ideas_list))
+        return by_index
+    
+    async def run_stage2_batched(self, formatted_transcript, ideas_list):
+        """
+        Stage 2 for all ideas: near matches from the semantic cache first (when
+        enabled), then the offline Batch API (when enabled) or one batched call,
+        then individual calls only for ideas not covered so far.
+        
+        Returns:
+            list: One entry per idea, in input order - either the segments
+                  dict or the exception raised for that idea
+        """
+        namespace = None
+        cached = {}
+        if self.cache is not None and self.semantic_cache_threshold > 0:
+            namespace = self.cache.make_namespace(self.provider.get_model_name(), formatted_transcript)
+            cached = await asyncio.to_thread(self._semantic_lookup, namespace, ideas_list)
+        
+        pending = [index for index in range(len(ideas_list)) if index not in cached]
+        pending_ideas = [ideas_list[index] for index in pending]
+        
+        batch = {}
+        if self.stage2_batch_api and self.provider.supports_batch_api and pending_ideas:
+            try:
+                batch = await self.run_stage2_batch_api(formatted_transcript, pending_ideas)
+            except RuntimeError as e:
+                logger.warning("  ⚠ %s - falling back to real-time calls", e)
+        
+        if not batch and self.batch_stage2 and len(pending_ideas) > 1:
+            try:
+                batch = await self.run_stage2_batch_async(formatted_transcript, pending_ideas)
+            except RuntimeError as e:
+                logger.warning("  ⚠ %s - falling back to per-idea calls", e)
+        
+        missing = [index for index in range(len(pending_ideas)) if index not in batch]
+        if missing:
+            fallback = await self.run_stage2_all(formatted_transcript, [pending_ideas[index] for index in missing])
+            batch.update(zip(missing, fallback))
+        
+        results = [batch[index] for index in range(len(pending_ideas))]
+        if namespace is not None:
+            await asyncio.to_thread(self._semantic_store, namespace, pending_ideas, results)
+        
+        cached.update(zip(pending, results))
+        return [cached[index] for index in range(len(ideas_list))]
+    
+    def _semantic_lookup(self, namespace, ideas_list):
+        """
+        Stage 2 results of near-identical ideas seen before on this transcript.
+        
+        Returns:
+            dict: idea index -> segments dict, for ideas with a cached near match
+        """
+        hits = {}
+        for index, idea in enumerate(ideas_list):
+            words = _content_words(f"{idea['title']} {idea['description']}")
+            response = self.cache.get_similar(namespace, words, self.semantic_cache_threshold)
+            if response is not None:
+                logger.info("  ⚡ Semantic cache hit for: '%s'", idea['title'])
+                hits[index] = orjson.loads(response)
+        return hits
+    
+    def _semantic_store(self, namespace, ideas_list, results):
+        """Remember successful Stage 2 results for later near-match lookups"""
+        for idea, result in zip(ideas_list, results):
+            if isinstance(result, dict):
+                words = _content_words(f"{idea['title']} {idea['description']}")
+                self.cache.add_similar(namespace, words, orjson.dumps(result).decode())
+    
+    def _parse_stage2_response(self, response):
+        """Parse and validate a Stage 2 LLM response (no retry on failure)."""
+        try:
+            segments_data = self.parse_llm_response(response)
+        except (json.JSONDecodeError, ValueError) as e:
+            # CRITICAL: Do NOT retry - this wastes credits
+            logger.error("    ✗ JSON parse failed: %s", e)
+            logger.error("    Raw response (first 300 chars): %s...", response[:300])
+            raise RuntimeError(f"Invalid JSON from LLM (no retry)")
+        
+        # Validate required keys
+        if 'segments' not in segments_data or 'reasoning' not in segments_data:
+            logger.warning("    ⚠️  Missing required keys (segments/reasoning)")
+            raise RuntimeError(f"Incomplete JSON response")
+        
+        num_segments = len(segments_data.get('segments', []))
+        logger.info("    ✓ Found %s segments", num_segments)
+        
+        return segments_data
 
     
+    def _keyword_prefilter(self, transcript_data, ideas_list):
+        """
+        Local pre-check before Stage 2: keep ideas whose title/description share
+        at least min_keyword_overlap content words with the transcript.
+        
+        Returns:
+            list: Indexes of ideas worth an LLM call
+        """
+        if self.min_keyword_overlap <= 0:
+            return list(range(len(ideas_list)))
+        
+        vocabulary = set()
+        for segment in transcript_data['segments']:
+            vocabulary.update(_WORD_RE.findall(segment['text'].lower()))
+        
+        grounded = []
+        for index, idea in enumerate(ideas_list):
+            keywords = _content_words(f"{idea['title']} {idea['description']}")
+            if len(keywords & vocabulary) >= self.min_keyword_overlap:
+                grounded.append(index)
+            else:
+                logger.warning("  ⚠ Skipping '%s': no keyword overlap with transcript", idea['title'])
+        return grounded
+    
     def enrich_segments(self, segments_data, transcript_data, idea_title):
         """
         Convert MM:SS timestamps to seconds
@@ -529,25 +1097,29 @@ IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure a
         
         PADDING_SECONDS = 1.0  # Add 1s padding at start/end for natural cuts
         
+        # Loop invariants
+        video_duration = transcript_data['duration']
+        min_segment_duration = self._thresholds.min_segment_duration
+        to_seconds = self.convert_timestamp_to_seconds
+        
         for segment in segments_data.get('segments', []):
-            start_seconds = self.convert_timestamp_to_seconds(segment['start'])
-            end_seconds = self.convert_timestamp_to_seconds(segment['end'])
+            start_seconds = to_seconds(segment['start'])
+            end_seconds = to_seconds(segment['end'])
             
             # Add padding (but don't go below 0 or beyond video duration)
             start_with_padding = max(0, start_seconds - PADDING_SECONDS)
-            end_with_padding = min(transcript_data['duration'], end_seconds + PADDING_SECONDS)
+            end_with_padding = min(video_duration, end_seconds + PADDING_SECONDS)
             
             # Validate timestamps
-            if start_with_padding >= transcript_data['duration']:
-                print(f"    ⚠ Invalid start time {segment['start']}")
+            if start_with_padding >= video_duration:
+                logger.warning("    ⚠ Invalid start time %s", segment['start'])
                 continue
             
             segment_duration = end_with_padding - start_with_padding
             
             # Mode-aware validation
-            thresholds = self.get_validation_thresholds()
-            if segment_duration < thresholds['min_segment_duration']:
-                print(f"    ⚠ Segment too short ({segment_duration:.1f}s): {segment['start']}-{segment['end']} - REJECTED")
+            if segment_duration < min_segment_duration:
+                logger.warning("    ⚠ Segment too short (%.1fs): %s-%s - REJECTED", segment_duration, segment['start'], segment['end'])
                 continue
             
             segments.append({
@@ -568,16 +1140,46 @@ IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure a
         Full two-stage Brain pipeline
         Input: transcript JSON path
         Output: ideas JSON with multi-segment support
+        
+        Synchronous entry point for callers without an event loop (CLI,
+        worker threads); see process_async().
+        """
+        return asyncio.run(self._process_and_close(transcript_path))
+    
+    async def _process_and_close(self, transcript_path):
+        """Run process_async() and release the provider's loop-bound clients"""
+        async with self:
+            return await self.process_async(transcript_path)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Release the provider's loop-bound connections and the prompt cache's SQLite connection"""
+        # Pooled keep-alive connections belong to this event loop; close them here
+        await self.provider.aclose()
+        if self.cache is not None:
+            self.cache.close()
+    
+    async def process_async(self, transcript_path):
+        """
+        Full two-stage Brain pipeline for use inside an event loop.
+        
+        Transcript loading/formatting runs in a worker thread and LLM calls are
+        awaited, so the loop is never blocked by Brain work.
         """
         # Load transcript
-        transcript_data = self.load_transcript(transcript_path)
-        formatted_transcript = self.format_transcript_for_llm(transcript_data)
+        transcript_data = await asyncio.to_thread(self.load_transcript, transcript_path)
+        formatted_transcript = await asyncio.to_thread(self.format_transcript_for_llm, transcript_data)
         
         # STAGE 1: Identify complete ideas
-        ideas_list = self.run_stage1(formatted_transcript)
+        ideas_list = await self.run_stage1_async(formatted_transcript)
         
         if not ideas_list:
-            print("No complete ideas found.")
+            logger.info("No complete ideas found.")
             return {
                 'video_id': transcript_data['video_id'],
                 'source_url': transcript_data['source_url'],
@@ -592,40 +1194,55 @@ IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure a
         skipped_ideas = 0  # Track JSON parse failures
         
         if ideas_list:
-            print(f"\n=== STAGE 2: Finding segments for {len(ideas_list)} ideas ===")
+            logger.info("=== STAGE 2: Finding segments for %s ideas ===", len(ideas_list))
         
-        for idx, idea in enumerate(ideas_list, 1):
-            print(f"\n[{idx}/{len(ideas_list)}] Processing: '{idea['title']}'")
+        # Don't spend an LLM call on ideas with no grounding in the transcript
+        grounded = await asyncio.to_thread(self._keyword_prefilter, transcript_data, ideas_list)
+        
+        # One batched call for all ideas; per-idea calls (concurrent) only for gaps
+        grounded_results = await self.run_stage2_batched(
+            formatted_transcript, [ideas_list[index] for index in grounded]
+        ) if grounded else []
+        stage2_results = [
+            RuntimeError("No keyword overlap with transcript - skipped without an LLM call")
+            for _ in ideas_list
+        ]
+        for index, result in zip(grounded, grounded_results):
+            stage2_results[index] = result
+        
+        for idx, (idea, segments_data) in enumerate(zip(ideas_list, stage2_results), 1):
+            logger.info("[%s/%s] Processing: '%s'", idx, len(ideas_list), idea['title'])
             
             try:
-                segments_data = self.run_stage2(formatted_transcript, idea)
+                if isinstance(segments_data, BaseException):
+                    raise segments_data
                 segments, total_duration = self.enrich_segments(segments_data, transcript_data, idea['title'])
                 
                 if not segments:
-                    print(f"    ⚠ No valid segments found (all rejected for being too short)")
+                    logger.warning("    ⚠ No valid segments found (all rejected for being too short)")
                     continue
                 
                 # VALIDATION: Reject ideas that are too long or have too many segments
-                thresholds = self.get_validation_thresholds()
-                if total_duration > thresholds['max_total_duration']:
-                    print(f"    ⚠ REJECTED: Too long ({total_duration}s) - likely a topic, not a moment")
+                thresholds = self._thresholds
+                if total_duration > thresholds.max_total_duration:
+                    logger.warning("    ⚠ REJECTED: Too long (%ss) - likely a topic, not a moment", total_duration)
                     continue
                 
-                if len(segments) > thresholds['max_segments']:
-                    print(f"    ⚠ REJECTED: Too many segments ({len(segments)}) - likely micro-chopped")
+                if len(segments) > thresholds.max_segments:
+                    logger.warning("    ⚠ REJECTED: Too many segments (%s) - likely micro-chopped", len(segments))
                     continue
                 
-                if total_duration < thresholds['min_total_duration']:
-                    print(f"    ⚠ REJECTED: Too short ({total_duration}s) - incomplete idea")
+                if total_duration < thresholds.min_total_duration:
+                    logger.warning("    ⚠ REJECTED: Too short (%ss) - incomplete idea", total_duration)
                     continue
                 
                 # STRICT: Check average segment duration
                 avg_segment_duration = total_duration / len(segments)
-                if avg_segment_duration < thresholds['min_avg_segment']:
-                    print(f"    ⚠ REJECTED: Micro-chopped (avg {avg_segment_duration:.1f}s per segment, need 15s+)")
+                if avg_segment_duration < thresholds.min_avg_segment:
+                    logger.warning("    ⚠ REJECTED: Micro-chopped (avg %.1fs per segment, need 15s+)", avg_segment_duration)
                     continue
                 
-                print(f"    ✓ ACCEPTED: {len(segments)} segments, {total_duration:.1f}s total, avg {avg_segment_duration:.1f}s per segment")
+                logger.info("    ✓ ACCEPTED: %s segments, %.1fs total, avg %.1fs per segment", len(segments), total_duration, avg_segment_duration)
                 
                 enriched_ideas.append({
                     'title': idea['title'],
@@ -642,18 +1259,21 @@ IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure a
                 error_msg = str(e)
                 if "Invalid JSON" in error_msg or "Incomplete JSON" in error_msg:
                     skipped_ideas += 1
-                    print(f"    ⚠️  Skipped due to JSON error (no retry to preserve credits)")
+                    logger.warning("    ⚠️  Skipped due to JSON error (no retry to preserve credits)")
                 else:
-                    print(f"    ✗ Error: {error_msg}")
+                    logger.error("    ✗ Error: %s", error_msg)
                 continue
             except Exception as e:
-                print(f"    ✗ Error: {str(e)}")
+                logger.error("    ✗ Error: %s", e)
                 continue
         
         
         # Show summary of skipped ideas
         if skipped_ideas > 0:
-            print(f"\n⚠️  Skipped {skipped_ideas} idea(s) due to JSON parse errors (no retries to preserve credits)")
+            logger.warning("⚠️  Skipped %s idea(s) due to JSON parse errors (no retries to preserve credits)", skipped_ideas)
+        
+        if self.cache is not None:
+            logger.info("Prompt cache: %(hits)s hit(s), %(misses)s miss(es)", self.cache.stats)
         
         # Build final output
         output = {
@@ -668,21 +1288,31 @@ IMPORTANT: Output ONLY valid JSON. No explanatory text before or after. Ensure a
         
         return output
     
-    def save_output(self, data, output_dir="output"):
-        """Save Brain output to JSON"""
+    def save_output(self, data, output_dir="output", compact=False):
+        """
+        Save Brain output to JSON
+        
+        Pretty-printed by default for humans; compact=True skips indentation
+        for files only read back by the pipeline.
+        """
         provider_name = self.provider.name().lower()
         output_path = Path(output_dir) / f"{data['video_id']}_ideas_{provider_name}.json"
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # orjson writes UTF-8 bytes directly (non-ASCII kept as-is, like ensure_ascii=False)
+        option = None if compact else orjson.OPT_INDENT_2
+        output_path.write_bytes(orjson.dumps(data, option=option))
         
-        print(f"\n✓ Brain processing complete")
-        print(f"✓ Model: {data['model_used']}")
-        print(f"✓ Method: {data['processing_method']}")
-        print(f"✓ Found {data['ideas_count']} complete ideas")
-        print(f"✓ Output: {output_path}")
+        logger.info("✓ Brain processing complete")
+        logger.info("✓ Model: %s", data['model_used'])
+        logger.info("✓ Method: %s", data['processing_method'])
+        logger.info("✓ Found %s complete ideas", data['ideas_count'])
+        logger.info("✓ Output: %s", output_path)
         
         return output_path
+    
+    def save_output_compact(self, data, output_dir="output"):
+        """Save Brain output as compact JSON (for pipeline consumers)"""
+        return self.save_output(data, output_dir, compact=True)
 
 
 # Command-line usage
@@ -699,6 +1329,7 @@ if __name__ == "__main__":
         print("  python brain.py output/VIDEO_ID_transcript.json groq")
         sys.exit(1)
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     transcript_path = sys.argv[1]
     brain = Brain()
     ideas = brain.process(transcript_path)
@@ -0,0 +1,147 @@
+"""
+Prompt Cache
+
+Exact-match cache of LLM responses keyed by (model, temperature, prompt), so
+re-running the Brain on the same transcript skips the LLM round trips.
+
+Also holds a near-match table, used to reuse a response when a new
+request is nearly identical by word content (see get_similar()).
+
+Backed by a local SQLite file (stdlib only). Off by default: set
+BRAIN_CACHE_PATH (e.g. output/brain_cache.sqlite3) to enable it. Entries never
+expire and sampled (temperature > 0) replies are replayed as-is, so a cached
+video can't yield new ideas - meant for development reruns, not production.
+
+Usage:
+    cache = PromptCache.from_env()
+    response = cache.get(model, temperature, prompt)
+    if response is None:
+        response = provider.query(prompt, temperature)
+        cache.set(model, temperature, prompt, response)
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+class PromptCache:
+    """Content-addressed LLM response cache stored in SQLite"""
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared across threads; sqlite3 calls are serialized by the lock
+        self._conn = None
+        self._lock = threading.Lock()
+        # Lookup counters for this process (read via stats)
+        self.hits = 0
+        self.misses = 0
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+            )
+            # Near-match entries: responses looked up by word-set similarity within a namespace
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS similar (namespace TEXT NOT NULL, words TEXT NOT NULL, response TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS similar_namespace ON similar (namespace)")
+
+    @classmethod
+    def from_env(cls) -> Optional["PromptCache"]:
+        """Create the cache from BRAIN_CACHE_PATH, or None if it isn't set (the default)"""
+        path = os.getenv("BRAIN_CACHE_PATH", "")
+        return cls(path) if path else None
+
+    def _connection(self) -> sqlite3.Connection:
+        """The shared connection, reopened after close(); call with the lock held"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        return self._conn
+
+    def close(self):
+        """Close the SQLite connection; the next lookup or store reopens it"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def make_key(model: str, temperature: float, prompt: str) -> str:
+        """Hash the model, temperature and prompt into a cache key"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{model}\0{temperature}\0".encode())
+        digest.update(prompt.encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_namespace(model: str, text: str) -> str:
+        """Hash the model and a shared context (e.g. the transcript) into a near-match namespace"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{model}\0".encode())
+        digest.update(text.encode())
+        return digest.hexdigest()
+
+    def get(self, model: str, temperature: float, prompt: str) -> Optional[str]:
+        """Return the cached response, or None on a miss"""
+        key = self.make_key(model, temperature, prompt)
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+    
+    @property
+    def stats(self) -> dict:
+        """Hit/miss counts since the cache was opened"""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def set(self, model: str, temperature: float, prompt: str, response: str):
+        """Store a response"""
+        key = self.make_key(model, temperature, prompt)
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)", (key, response)
+            )
+    
+    def get_similar(self, namespace: str, words: set, threshold: float) -> Optional[str]:
+        """
+        Return the response stored under the most similar word set in namespace.
+        
+        Similarity is the cosine of the two word sets (|A & B| / sqrt(|A| * |B|));
+        None if nothing reaches the threshold.
+        """
+        if not words:
+            return None
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT words, response FROM similar WHERE namespace = ?", (namespace,)
+            ).fetchall()
+        best, best_score = None, threshold
+        for stored, response in rows:
+            stored_words = set(stored.split())
+            score = len(words & stored_words) / math.sqrt(len(words) * len(stored_words)) if stored_words else 0.0
+            if score >= best_score:
+                best, best_score = response, score
+        with self._lock:
+            if best is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return best
+    
+    def add_similar(self, namespace: str, words: set, response: str):
+        """Store a response for later near-match lookups"""
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "INSERT INTO similar (namespace, words, response) VALUES (?, ?, ?)",
+                (namespace, " ".join(sorted(words)), response)
+            )
@@ -11,10 +11,263 @@ Usage:
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, Iterator, List, Optional
+import asyncio
+import json
+import logging
 import os
-from openai import OpenAI  # Used by OpenRouter for API compatibility, NOT for OpenAI service
-from groq import Groq
+import re
+import threading
+import time
+import httpx
+from openai import NOT_GIVEN as OPENAI_NOT_GIVEN, OpenAI, AsyncOpenAI  # Used by OpenRouter for API compatibility, NOT for OpenAI service
+from groq import NOT_GIVEN as GROQ_NOT_GIVEN, Groq, AsyncGroq
+
+
+logger = logging.getLogger(__name__)
+
+
+# Connection pool shared by LLM calls; HTTP/2 multiplexes concurrent Stage 2
+# requests over one TLS connection per host. Preflight goes through the same
+# sync pool, so the TLS session it opens is reused by later sync queries.
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60)
+
+
+@lru_cache(maxsize=1)
+def _shared_http_client() -> httpx.Client:
+    """Process-wide sync HTTP client reused by every provider"""
+    return httpx.Client(http2=True, limits=LLM_HTTP_LIMITS)
+
+
+@lru_cache(maxsize=None)
+def _groq_client(api_key: str, timeout: float, max_retries: int) -> Groq:
+    """Sync Groq client, memoized so rebuilding the provider chain reuses it"""
+    return Groq(api_key=api_key, timeout=timeout, max_retries=max_retries, http_client=_shared_http_client())
+
+
+# Constrains chat completions to one JSON object (JSON mode)
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+
+# Attribution headers set once on the OpenRouter clients instead of per request
+OPENROUTER_HEADERS = {
+    "HTTP-Referer": "https://gist-ai.com",
+    "X-Title": "Gist AI"
+}
+
+
+@lru_cache(maxsize=None)
+def _openrouter_client(api_key: str, timeout: float, max_retries: int) -> OpenAI:
+    """Sync OpenRouter client, memoized so rebuilding the provider chain reuses it"""
+    return OpenAI(
+        base_url="https://openrouter.ai/api/v1",
+        api_key=api_key,
+        timeout=timeout,
+        max_retries=max_retries,
+        default_headers=OPENROUTER_HEADERS,
+        http_client=_shared_http_client()
+    )
+
+
+class ProviderError(Exception):
+    """Base class for classified provider failures"""
+
+
+class ProviderAuthError(ProviderError):
+    """API key rejected (401) - retrying will never succeed"""
+
+
+class ProviderRateLimitError(ProviderError):
+    """Provider is rate limiting us (429) - back off for a while"""
+
+
+class ProviderNetworkError(ProviderError):
+    """Timeout or connection failure - worth trying again later"""
+
+
+# Seconds a rate-limited provider is skipped by later preflight rounds
+RATE_LIMIT_COOLDOWN = 60.0
+# Provider name -> monotonic deadline; auth failures never expire in this process
+_provider_cooldowns = {}
+_provider_cooldowns_lock = threading.Lock()
+
+
+# Error message patterns checked in order; first match decides the error type
+_PREFLIGHT_ERROR_PATTERNS = (
+    (re.compile(r"invalid_api_key|401", re.IGNORECASE), ProviderAuthError),
+    (re.compile(r"rate_limit|429", re.IGNORECASE), ProviderRateLimitError),
+    (re.compile(r"timeout|connection", re.IGNORECASE), ProviderNetworkError),
+)
+_OK_RE = re.compile(r"ok", re.IGNORECASE)
+
+
+def _classify_preflight_error(error: Exception) -> ProviderError:
+    """Map an SDK/HTTP exception to the matching ProviderError"""
+    error_msg = str(error)
+    for pattern, error_type in _PREFLIGHT_ERROR_PATTERNS:
+        if pattern.search(error_msg):
+            return error_type(error_msg)
+    return ProviderError(error_msg)
+
+
+# Last successful preflight, persisted so quick restarts can skip the LLM round trip.
+# Opt in by pointing GIST_PREFLIGHT_CACHE at a writable file; off (None) by default.
+PREFLIGHT_CACHE_PATH = Path(os.environ["GIST_PREFLIGHT_CACHE"]) if os.getenv("GIST_PREFLIGHT_CACHE") else None
+PREFLIGHT_CACHE_TTL = 300.0
+
+
+def _read_preflight_cache() -> Optional[str]:
+    """Return the model name of a provider that passed preflight within the TTL"""
+    if PREFLIGHT_CACHE_PATH is None:
+        return None
+    try:
+        entry = json.loads(PREFLIGHT_CACHE_PATH.read_text())
+        if time.time() - entry["ts"] < PREFLIGHT_CACHE_TTL:
+            return entry["model"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _write_preflight_cache(model: Optional[str]):
+    """Record a successful preflight (or clear the record with None), atomically"""
+    if PREFLIGHT_CACHE_PATH is None:
+        return
+    try:
+        if model is None:
+            PREFLIGHT_CACHE_PATH.unlink(missing_ok=True)
+            return
+        _write_json_atomic(PREFLIGHT_CACHE_PATH, {"model": model, "ts": time.time()})
+    except OSError as e:
+        # The cache is an optimization only
+        logger.debug("Could not update preflight cache: %s", e)
+
+
+def _write_json_atomic(path: Path, data):
+    """Write JSON via a temp file + rename so readers never see a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data))
+    os.replace(tmp_path, path)
+
+
+# Per-model preflight history (EWMA latency in seconds + success rate), persisted
+# next to the preflight cache (when enabled) so a cold start still ranks providers sensibly
+PROVIDER_STATS_PATH = PREFLIGHT_CACHE_PATH.with_name("provider_stats.json") if PREFLIGHT_CACHE_PATH else None
+LATENCY_EWMA_ALPHA = 0.1
+_provider_stats = None
+_provider_stats_lock = threading.Lock()
+
+
+def _get_provider_stats() -> dict:
+    """Model name -> {"latency": ewma, "success": rate}; call with the stats lock held"""
+    global _provider_stats
+    if _provider_stats is None:
+        _provider_stats = {}
+        if PROVIDER_STATS_PATH is not None:
+            try:
+                loaded = json.loads(PROVIDER_STATS_PATH.read_text())
+                _provider_stats = {
+                    model: {"latency": float(entry["latency"]), "success": float(entry["success"])}
+                    for model, entry in loaded.items()
+                }
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                pass
+    return _provider_stats
+
+
+def _record_preflight(model: str, latency: float, ok: bool):
+    """Fold one preflight outcome into the model's moving averages (in memory)"""
+    with _provider_stats_lock:
+        stats = _get_provider_stats()
+        entry = stats.get(model)
+        if entry is None:
+            entry = stats[model] = {"latency": latency, "success": 1.0 if ok else 0.0}
+        else:
+            entry["success"] += LATENCY_EWMA_ALPHA * ((1.0 if ok else 0.0) - entry["success"])
+            # Failures (timeouts, 429s) say nothing about how fast a healthy reply is
+            if ok:
+                entry["latency"] += LATENCY_EWMA_ALPHA * (latency - entry["latency"])
+
+
+def _save_provider_stats():
+    """Persist the moving averages once per selection round (no-op without a stats file)"""
+    if PROVIDER_STATS_PATH is None:
+        return
+    with _provider_stats_lock:
+        stats = {model: dict(entry) for model, entry in _get_provider_stats().items()}
+    try:
+        _write_json_atomic(PROVIDER_STATS_PATH, stats)
+    except OSError as e:
+        logger.debug("Could not persist provider stats: %s", e)
+
+
+def _provider_score(provider: "LLMProvider") -> Optional[float]:
+    """Expected cost of a provider (lower is better), or None with no history"""
+    with _provider_stats_lock:
+        entry = _get_provider_stats().get(provider.get_model_name())
+    if entry is None:
+        return None
+    return entry["latency"] / max(entry["success"], 0.05)
+
+
+def _timed_preflight(provider: "LLMProvider") -> float:
+    """
+    Run a provider's preflight in a worker thread (the only preflight_check caller).
+    
+    Returns:
+        float: Latency in seconds of a passing check; the selector records it
+               only if it still needed this provider's answer
+    
+    Raises:
+        ProviderError: The check failed
+    """
+    started = time.monotonic()
+    provider.preflight_check()
+    return time.monotonic() - started
+
+
+def _stream_says_ok(response) -> bool:
+    """Read a streamed preflight reply only until it contains 'ok', then close it"""
+    text = ""
+    try:
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                text += chunk.choices[0].delta.content
+                if _OK_RE.search(text):
+                    return True
+        return False
+    finally:
+        response.close()
+
+
+def _new_async_http_client() -> httpx.AsyncClient:
+    """
+    Async HTTP client for one provider instance.
+    
+    Not shared process-wide: an AsyncClient's pool is bound to the event loop
+    it is used on, and Brain.process() runs each video on a fresh loop.
+    """
+    return httpx.AsyncClient(http2=True, limits=LLM_HTTP_LIMITS)
+
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    """API keys for every provider, read from the environment in one place"""
+    openrouter_key: Optional[str]
+    groq_key: Optional[str]
+    
+    @classmethod
+    def from_env(cls) -> "ProviderConfig":
+        # Read per chain rather than at import, so .env loaded later still counts
+        return cls(
+            openrouter_key=os.getenv("OPENROUTER_API_KEY") or None,
+            groq_key=os.getenv("GROQ_API_KEY") or None
+        )
 
 
 class LLMProvider(ABC):
@@ -31,15 +284,81 @@ class LLMProvider(ABC):
         pass
     
     @abstractmethod
-    def preflight_check(self) -> bool:
-        """Quick test to verify provider is working (< 5s)"""
+    def preflight_check(self) -> None:
+        """
+        Quick test to verify provider is working (< 5s); returns only if it is
+        
+        Raises:
+            ProviderError: Not configured, no 'OK' reply, or a classified API
+                           failure (auth, rate limit, network, other)
+        """
         pass
     
     @abstractmethod
-    def query(self, prompt: str, temperature: float = 0.3) -> str:
-        """Send prompt and return response"""
+    def query(self, prompt: str, temperature: float = 0.3, json_mode: bool = False) -> str:
+        """
+        Send prompt and return response.
+        
+        json_mode asks the API for a single JSON object (response_format
+        json_object); the prompt itself must still ask for JSON.
+        """
+        pass
+    
+    async def aquery(self, prompt: str, temperature: float = 0.3, json_mode: bool = False) -> str:
+        """
+        Send prompt and return response without blocking the event loop.
+        
+        Default runs query() in a worker thread; providers with a native
+        async SDK client override this.
+        """
+        return await asyncio.to_thread(self.query, prompt, temperature, json_mode)
+    
+    async def aclose(self):
+        """
+        Release async HTTP resources bound to the current event loop.
+        
+        Providers with a native async client close it and prepare a fresh one,
+        so the provider stays usable from the next event loop.
+        """
         pass
     
+    def stream(self, prompt: str, temperature: float = 0.3, json_mode: bool = False) -> Iterator[str]:
+        """
+        Yield the response as text deltas while it is generated.
+        
+        Closing the generator early closes the underlying HTTP stream.
+        Default yields the whole query() response at once.
+        """
+        yield self.query(prompt, temperature, json_mode)
+    
+    async def astream(self, prompt: str, temperature: float = 0.3, json_mode: bool = False) -> AsyncIterator[str]:
+        """Async counterpart of stream()"""
+        yield await self.aquery(prompt, temperature, json_mode)
+    
+    # True when query_batch() submits to a discounted offline Batch API
+    supports_batch_api = False
+    
+    # Seconds the selector waits for this provider's preflight answer
+    preflight_timeout = 5.0
+    
+    def query_batch(self, prompts: List[str], temperature: float = 0.3, poll_interval: float = 30.0,
+                    max_wait: Optional[float] = None, json_mode: bool = False) -> List[Optional[str]]:
+        """
+        Run prompts through the provider's offline Batch API and wait for them.
+        
+        Blocks until the batch finishes (minutes to hours), so only for jobs
+        where cost matters more than latency. With max_wait, a batch still
+        running after that many seconds is cancelled instead of waited on.
+        
+        Returns:
+            One response per prompt, in input order (None where that request failed)
+        
+        Raises:
+            RuntimeError: If the batch as a whole fails, expires, is cancelled
+                          or runs past max_wait
+        """
+        raise RuntimeError(f"{self.name()} has no Batch API")
+    
     @abstractmethod
     def get_model_name(self) -> str:
         """Return model identifier for logging"""
@@ -49,13 +368,34 @@ class LLMProvider(ABC):
 class GroqProvider(LLMProvider):
     """Groq API provider (fast, free tier available)"""
     
-    def __init__(self, model: str = "llama-3.3-70b-versatile"):
+    def __init__(self, model: str = "llama-3.3-70b-versatile", timeout: float = 30.0,
+                 preflight_timeout: float = 5.0, max_retries: int = 1, api_key: Optional[str] = None):
         self.model = model
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
+        # Per-provider latency budgets: fail fast so the fallback chain gets a turn
+        self.timeout = timeout
+        self.preflight_timeout = preflight_timeout
+        self.max_retries = max_retries
+        # Read once; the async client is rebuilt from this after every aclose()
+        self.api_key = api_key if api_key is not None else os.getenv("GROQ_API_KEY")
+        if not self.api_key:
             self.client = None
+            self.async_client = None
         else:
-            self.client = Groq(api_key=api_key)
+            self.client = _groq_client(self.api_key, self.timeout, self.max_retries)
+            self.async_client = self._new_async_client()
+    
+    def _new_async_client(self) -> AsyncGroq:
+        return AsyncGroq(
+            api_key=self.api_key,
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            http_client=_new_async_http_client()
+        )
+    
+    async def aclose(self):
+        if self.async_client:
+            await self.async_client.close()
+            self.async_client = self._new_async_client()
     
     def name(self) -> str:
         return "Groq"
@@ -63,41 +403,152 @@ class GroqProvider(LLMProvider):
     def is_available(self) -> bool:
         return self.client is not None
     
-    def preflight_check(self) -> bool:
-        """Test with minimal prompt to verify API is working"""
+    def preflight_check(self) -> None:
+        """Test with minimal prompt to verify API is working (raises ProviderError if not)"""
         if not self.is_available():
-            print(f"  ❌ Groq not configured (missing GROQ_API_KEY)")
-            return False
+            raise ProviderError("Groq not configured (missing GROQ_API_KEY)")
         
         try:
-            response = self.query("Say 'OK'", temperature=0)
-            return "ok" in response.lower()
+            # Short budget, no retries and a tiny completion: this is only a liveness probe
+            response = self.client.with_options(
+                timeout=self.preflight_timeout, max_retries=0
+            ).chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": "Say 'OK'"}],
+                temperature=0,
+                max_tokens=5,
+                stream=True
+            )
+            # Healthy as soon as "OK" starts arriving; no need to wait for the full reply
+            answered = _stream_says_ok(response)
         except Exception as e:
-            error_msg = str(e).lower()
-            
-            # Categorize errors for better debugging
-            if "invalid_api_key" in error_msg or "401" in error_msg:
-                print(f"  ❌ INVALID API KEY - Check GROQ_API_KEY in .env")
-            elif "rate_limit" in error_msg or "429" in error_msg:
-                print(f"  ⚠️  Rate limited - Will try next provider")
-            elif "timeout" in error_msg or "connection" in error_msg:
-                print(f"  ⚠️  Network error - Will try next provider")
-            else:
-                print(f"  ⚠️  Groq preflight failed: {e}")
-            
-            return False
-    
-    def query(self, prompt: str, temperature: float = 0.3) -> str:
+            # Typed so the selector can tell "never retry" from "try again later"
+            raise _classify_preflight_error(e) from e
+        if not answered:
+            raise ProviderError(f"{self.name()} preflight reply did not contain 'OK'")
+    
+    def query(self, prompt: str, temperature: float = 0.3, json_mode: bool = False) -> str:
         if not self.client:
             raise RuntimeError("Groq client not initialized")
         
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
-            temperature=temperature
+            temperature=temperature,
+            response_format=JSON_RESPONSE_FORMAT if json_mode else GROQ_NOT_GIVEN
+        )
+        return response.choices[0].message.content
+    
+    async def aquery(self, prompt: str, temperature: float = 0.3, json_mode: bool = False) -> str:
+        if not self.async_client:
+            raise RuntimeError("Groq client not initialized")
+        
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            response_format=JSON_RESPONSE_FORMAT if json_mode else GROQ_NOT_GIVEN
         )
         return response.choices[0].message.content
     
+    def stream(self, prompt: str, temperature: float = 0.3, json_mode: bool = False) -> Iterator[str]:
+        if not self.client:
+            raise RuntimeError("Groq client not initialized")
+        if json_mode:
+            # Groq doesn't stream in JSON mode; deliver the whole object at once
+            yield self.query(prompt, temperature, json_mode)
+            return
+        
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            response_format=JSON_RESPONSE_FORMAT if json_mode else GROQ_NOT_GIVEN,
+            stream=True
+        )
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            response.close()
+    
+    async def astream(self, prompt: str, temperature: float = 0.3, json_mode: bool = False) -> AsyncIterator[str]:
+        if not self.async_client:
+            raise RuntimeError("Groq client not initialized")
+        if json_mode:
+            # Groq doesn't stream in JSON mode; deliver the whole object at once
+            yield await self.aquery(prompt, temperature, json_mode)
+            return
+        
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            response_format=JSON_RESPONSE_FORMAT if json_mode else GROQ_NOT_GIVEN,
+            stream=True
+        )
+        try:
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await response.close()
+    
+    supports_batch_api = True
+    
+    def query_batch(self, prompts: List[str], temperature: float = 0.3, poll_interval: float = 30.0,
+                    max_wait: Optional[float] = None, json_mode: bool = False) -> List[Optional[str]]:
+        if not self.client:
+            raise RuntimeError("Groq client not initialized")
+        
+        # One JSONL request per prompt; custom_id maps results back to input order
+        options = {"response_format": JSON_RESPONSE_FORMAT} if json_mode else {}
+        requests = b"\n".join(
+            json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": temperature,
+                    **options
+                }
+            }).encode()
+            for index, prompt in enumerate(prompts)
+        )
+        input_file = self.client.files.create(file=("batch.jsonl", requests), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("  📦 Submitted Groq batch %s (%s requests)", batch.id, len(prompts))
+        
+        deadline = time.monotonic() + max_wait if max_wait is not None else None
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if deadline is not None and time.monotonic() >= deadline:
+                # Don't leave a batch we've stopped waiting for running (and billing)
+                self.client.batches.cancel(batch.id)
+                raise RuntimeError(f"Groq batch {batch.id} still '{batch.status}' after {max_wait:.0f}s - cancelled")
+            time.sleep(poll_interval if deadline is None else min(poll_interval, max(deadline - time.monotonic(), 0.0)))
+            batch = self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Groq batch {batch.id} ended with status '{batch.status}'")
+        
+        responses = [None] * len(prompts)
+        output = self.client.files.content(batch.output_file_id).read()
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if response.get("status_code") == 200:
+                responses[int(result["custom_id"])] = response["body"]["choices"][0]["message"]["content"]
+        return responses
+    
     def get_model_name(self) -> str:
         return f"groq:{self.model}"
 
@@ -105,16 +556,36 @@ class GroqProvider(LLMProvider):
 class OpenRouterProvider(LLMProvider):
     """OpenRouter API provider (unified LLM access)"""
     
-    def __init__(self, model: str = "meta-llama/llama-3.3-70b-instruct"):
+    def __init__(self, model: str = "meta-llama/llama-3.3-70b-instruct", timeout: float = 60.0,
+                 preflight_timeout: float = 5.0, max_retries: int = 1, api_key: Optional[str] = None):
         self.model = model
-        api_key = os.getenv("OPENROUTER_API_KEY")
-        if not api_key:
+        # Per-provider latency budgets: fail fast so the fallback chain gets a turn
+        self.timeout = timeout
+        self.preflight_timeout = preflight_timeout
+        self.max_retries = max_retries
+        # Read once; the async client is rebuilt from this after every aclose()
+        self.api_key = api_key if api_key is not None else os.getenv("OPENROUTER_API_KEY")
+        if not self.api_key:
             self.client = None
+            self.async_client = None
         else:
-            self.client = OpenAI(
-                base_url="https://openrouter.ai/api/v1",
-                api_key=api_key
-            )
+            self.client = _openrouter_client(self.api_key, self.timeout, self.max_retries)
+            self.async_client = self._new_async_client()
+    
+    def _new_async_client(self) -> AsyncOpenAI:
+        return AsyncOpenAI(
+            base_url="https://openrouter.ai/api/v1",
+            api_key=self.api_key,
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            default_headers=OPENROUTER_HEADERS,
+            http_client=_new_async_http_client()
+        )
+    
+    async def aclose(self):
+        if self.async_client:
+            await self.async_client.close()
+            self.async_client = self._new_async_client()
     
     def name(self) -> str:
         return "OpenRouter"
@@ -122,31 +593,31 @@ class OpenRouterProvider(LLMProvider):
     def is_available(self) -> bool:
         return self.client is not None
     
-    def preflight_check(self) -> bool:
-        """Test with minimal prompt to verify API is working"""
+    def preflight_check(self) -> None:
+        """Test with minimal prompt to verify API is working (raises ProviderError if not)"""
         if not self.is_available():
-            print(f"  ❌ OpenRouter not configured (missing OPENROUTER_API_KEY)")
-            return False
+            raise ProviderError("OpenRouter not configured (missing OPENROUTER_API_KEY)")
         
         try:
-            response = self.query("Say 'OK'", temperature=0)
-            return "ok" in response.lower()
+            # Short budget, no retries and a tiny completion: this is only a liveness probe
+            response = self.client.with_options(
+                timeout=self.preflight_timeout, max_retries=0
+            ).chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": "Say 'OK'"}],
+                temperature=0,
+                max_tokens=5,
+                stream=True
+            )
+            # Healthy as soon as "OK" starts arriving; no need to wait for the full reply
+            answered = _stream_says_ok(response)
         except Exception as e:
-            error_msg = str(e).lower()
-            
-            # Categorize errors for better debugging
-            if "invalid_api_key" in error_msg or "401" in error_msg:
-                print(f"  ❌ INVALID API KEY - Check OPENROUTER_API_KEY in .env")
-            elif "rate_limit" in error_msg or "429" in error_msg:
-                print(f"  ⚠️  Rate limited - Will try next provider")
-            elif "timeout" in error_msg or "connection" in error_msg:
-                print(f"  ⚠️  Network error - Will try next provider")
-            else:
-                print(f"  ⚠️  OpenRouter preflight failed: {e}")
-            
-            return False
-    
-    def query(self, prompt: str, temperature: float = 0.3) -> str:
+            # Typed so the selector can tell "never retry" from "try again later"
+            raise _classify_preflight_error(e) from e
+        if not answered:
+            raise ProviderError(f"{self.name()} preflight reply did not contain 'OK'")
+    
+    def query(self, prompt: str, temperature: float = 0.3, json_mode: bool = False) -> str:
         if not self.client:
             raise RuntimeError("OpenRouter client not initialized")
         
@@ -154,13 +625,58 @@ class OpenRouterProvider(LLMProvider):
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=temperature,
-            extra_headers={
-                "HTTP-Referer": "https://gist-ai.com",
-                "X-Title": "Gist AI"
-            }
+            response_format=JSON_RESPONSE_FORMAT if json_mode else OPENAI_NOT_GIVEN
+        )
+        return response.choices[0].message.content
+    
+    async def aquery(self, prompt: str, temperature: float = 0.3, json_mode: bool = False) -> str:
+        if not self.async_client:
+            raise RuntimeError("OpenRouter client not initialized")
+        
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            response_format=JSON_RESPONSE_FORMAT if json_mode else OPENAI_NOT_GIVEN
         )
         return response.choices[0].message.content
     
+    def stream(self, prompt: str, temperature: float = 0.3, json_mode: bool = False) -> Iterator[str]:
+        if not self.client:
+            raise RuntimeError("OpenRouter client not initialized")
+        
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            response_format=JSON_RESPONSE_FORMAT if json_mode else OPENAI_NOT_GIVEN,
+            stream=True
+        )
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            response.close()
+    
+    async def astream(self, prompt: str, temperature: float = 0.3, json_mode: bool = False) -> AsyncIterator[str]:
+        if not self.async_client:
+            raise RuntimeError("OpenRouter client not initialized")
+        
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            response_format=JSON_RESPONSE_FORMAT if json_mode else OPENAI_NOT_GIVEN,
+            stream=True
+        )
+        try:
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await response.close()
+    
     def get_model_name(self) -> str:
         return f"openrouter:{self.model}"
 
@@ -184,22 +700,21 @@ class ProviderFactory:
             RuntimeError: If NO providers are configured
         """
         providers = []
+        config = ProviderConfig.from_env()
         
         # Check OpenRouter (PRIMARY)
-        openrouter_key = os.getenv("OPENROUTER_API_KEY")
-        if openrouter_key:
-            print("  ✓ OpenRouter configured (primary)")
-            providers.append(OpenRouterProvider())
+        if config.openrouter_key:
+            logger.info("  ✓ OpenRouter configured (primary)")
+            providers.append(OpenRouterProvider(api_key=config.openrouter_key))
         else:
-            print("  ⚠️  OpenRouter not configured (missing OPENROUTER_API_KEY)")
+            logger.warning("  ⚠️  OpenRouter not configured (missing OPENROUTER_API_KEY)")
         
         # Check Groq (OPTIONAL FALLBACK)
-        groq_key = os.getenv("GROQ_API_KEY")
-        if groq_key:
-            print("  ✓ Groq configured (fallback)")
-            providers.append(GroqProvider())
+        if config.groq_key:
+            logger.info("  ✓ Groq configured (fallback)")
+            providers.append(GroqProvider(api_key=config.groq_key))
         else:
-            print("  ⚠️  Groq not configured (missing GROQ_API_KEY) - skipping")
+            logger.warning("  ⚠️  Groq not configured (missing GROQ_API_KEY) - skipping")
         
         # Ensure at least one provider is available
         if not providers:
@@ -210,9 +725,21 @@ class ProviderFactory:
                 "   - GROQ_API_KEY (optional fallback)"
             )
         
-        print(f"  📋 Registered {len(providers)} provider(s): {', '.join(p.name() for p in providers)}")
+        logger.info("  📋 Registered %s provider(s): %s", len(providers), ', '.join(p.name() for p in providers))
         return providers
     
+    @staticmethod
+    def _cool_down(provider: LLMProvider, seconds: float):
+        """Keep a provider out of preflight rounds for the given number of seconds"""
+        with _provider_cooldowns_lock:
+            _provider_cooldowns[provider.name()] = time.monotonic() + seconds
+    
+    @staticmethod
+    def forget_preflight(provider: LLMProvider):
+        """Drop a cached preflight pass for a provider whose real calls are now failing"""
+        if _read_preflight_cache() == provider.get_model_name():
+            _write_preflight_cache(None)
+    
     @staticmethod
     def select_provider_with_preflight(providers: List[LLMProvider], skip_preflight: bool = False) -> LLMProvider:
         """
@@ -232,25 +759,96 @@ class ProviderFactory:
             # Use first available provider without testing
             for provider in providers:
                 if provider.is_available():
-                    print(f"  ⚡ Skipping preflight checks, using {provider.name()}")
+                    logger.info("  ⚡ Skipping preflight checks, using %s", provider.name())
                     return provider
             raise RuntimeError("No providers available")
         
-        print("🔍 Running preflight checks...")
+        # A provider that passed preflight moments ago (e.g. before a restart) is trusted
+        # as-is; Brain clears the entry via forget_preflight() if its calls then fail
+        cached_model = _read_preflight_cache()
+        if cached_model:
+            now = time.monotonic()
+            for provider in providers:
+                if provider.get_model_name() == cached_model and provider.is_available():
+                    with _provider_cooldowns_lock:
+                        cooling_down = _provider_cooldowns.get(provider.name(), 0.0) > now
+                    if not cooling_down:
+                        logger.info("  ⚡ %s passed preflight recently, skipping checks", provider.name())
+                        return provider
+        
+        logger.info("🔍 Running preflight checks...")
         failed_providers = []
         
+        candidates = []
+        now = time.monotonic()
         for provider in providers:
             # Skip providers that aren't configured (no API key)
             if not provider.is_available():
-                print(f"  ⏭️  Skipping {provider.name()} (not configured)")
+                logger.info("  ⏭️  Skipping %s (not configured)", provider.name())
                 continue
-            
-            print(f"  🧪 Testing {provider.name()}...")
-            if provider.preflight_check():
-                print(f"  ✅ {provider.name()} is working!")
-                return provider
-            else:
+            # Skip providers that recently failed auth or rate limited us
+            with _provider_cooldowns_lock:
+                cooldown_until = _provider_cooldowns.get(provider.name(), 0.0)
+            if cooldown_until > now:
+                logger.warning("  ⏭️  Skipping %s (cooling down after an earlier failure)", provider.name())
                 failed_providers.append(provider.name())
+                continue
+            logger.info("  🧪 Testing %s...", provider.name())
+            candidates.append(provider)
+        
+        # Once every candidate has history, prefer the one that has been fastest and
+        # most reliable lately; otherwise keep the configured priority order
+        scores = [_provider_score(provider) for provider in candidates]
+        if candidates and None not in scores:
+            candidates = [provider for _, _, provider in sorted(
+                zip(scores, range(len(candidates)), candidates), key=lambda item: item[:2]
+            )]
+            logger.info("  📈 Preflight order by recent latency: %s", ', '.join(p.name() for p in candidates))
+        
+        # Preflight all candidates concurrently (wall time ~ max RTT, not the sum),
+        # then take results in that order so the preferred provider wins when healthy.
+        # Only outcomes the selector actually waited for are recorded; a lower-priority
+        # probe still in flight when a winner is chosen can't be recalled (its tiny
+        # completion is still billed) but its result is ignored.
+        if candidates:
+            executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="preflight")
+            try:
+                submitted = time.monotonic()
+                futures = [executor.submit(_timed_preflight, provider) for provider in candidates]
+                for provider, future in zip(candidates, futures):
+                    ok = False
+                    latency = provider.preflight_timeout
+                    try:
+                        # Each probe's budget counts from submission, as they all run at once
+                        remaining = max(submitted + provider.preflight_timeout - time.monotonic(), 0.0)
+                        latency = future.result(timeout=remaining)
+                        ok = True
+                    except FuturesTimeoutError:
+                        logger.warning("  ⚠️  %s preflight timed out after %.1fs - Will try next provider", provider.name(), provider.preflight_timeout)
+                    except ProviderAuthError:
+                        logger.error("  ❌ INVALID API KEY - Check the %s API key in .env", provider.name())
+                        ProviderFactory._cool_down(provider, float("inf"))
+                        if cached_model == provider.get_model_name():
+                            _write_preflight_cache(None)
+                    except ProviderRateLimitError:
+                        logger.warning("  ⚠️  %s rate limited - Skipping it for %.0fs", provider.name(), RATE_LIMIT_COOLDOWN)
+                        ProviderFactory._cool_down(provider, RATE_LIMIT_COOLDOWN)
+                    except ProviderNetworkError:
+                        logger.warning("  ⚠️  %s network error - Will try next provider", provider.name())
+                    except ProviderError as e:
+                        logger.warning("  ⚠️  %s preflight failed: %s", provider.name(), e)
+                    _record_preflight(provider.get_model_name(), latency, ok)
+                    if ok:
+                        logger.info("  ✅ %s is working!", provider.name())
+                        _write_preflight_cache(provider.get_model_name())
+                        return provider
+                    failed_providers.append(provider.name())
+            finally:
+                # Don't wait on lower-priority checks once a provider is chosen
+                # (not-yet-started ones are cancelled; running ones finish unobserved)
+                executor.shutdown(wait=False, cancel_futures=True)
+                # One stats write per round instead of one per probe
+                _save_provider_stats()
         
         # All configured providers failed
         raise RuntimeError(
@@ -0,0 +1 @@
+"""Pytest root: makes the backend packages (brain, api, ...) importable from tests/"""
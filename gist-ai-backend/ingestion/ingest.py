@@ -5,7 +5,7 @@ Converts YouTube video to timestamped transcript JSON
 
 import whisper
 import yt_dlp
-import json
+import orjson
 import os
 from pathlib import Path
 
@@ -152,8 +152,9 @@ class VideoIngestion:
         """Save transcript to JSON file"""
         output_path = self.output_dir / f"{video_id}_transcript.json"
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Whisper word timings can be numpy floats, hence OPT_SERIALIZE_NUMPY
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         
         print(f"Transcript saved: {output_path}")
         return output_path
@@ -0,0 +1,24 @@
+-- Migration: Bulk segment insert function
+-- Run this in Supabase SQL Editor
+-- Purpose: Insert all segments for a video as a single INSERT ... SELECT
+--          (called by SegmentRepository.bulk_create_segments via supabase.rpc)
+
+CREATE OR REPLACE FUNCTION create_segments_bulk(payload JSONB)
+RETURNS SETOF segments
+LANGUAGE sql
+AS $$
+    INSERT INTO segments (idea_id, start_time, end_time, duration, sequence_order, purpose)
+    SELECT idea_id, start_time, end_time, duration, sequence_order, purpose
+    FROM jsonb_to_recordset(payload) AS x(
+        idea_id UUID,
+        start_time FLOAT,
+        end_time FLOAT,
+        duration FLOAT,
+        sequence_order INTEGER,
+        purpose TEXT
+    )
+    RETURNING *;
+$$;
+
+-- Make the new function visible to PostgREST immediately
+NOTIFY pgrst, 'reload schema';
@@ -9,8 +9,9 @@ Usage:
 
 import sys
 import argparse
+import logging
 from pathlib import Path
-import json
+import orjson
 
 # Import components
 from ingestion.ingest import VideoIngestion
@@ -19,9 +20,13 @@ from stitcher.stitch import Stitcher
 
 
 class GistPipeline:
-    def __init__(self, mode="groq", skip_stitch=False):
+    def __init__(self, mode="groq", skip_stitch=False, compact_output=False, stage2_batch_api=False):
         self.mode = mode
         self.skip_stitch = skip_stitch
+        # Write ideas JSON without indentation (when only machines read it)
+        self.compact_output = compact_output
+        # Run Brain Stage 2 through the provider's offline Batch API (slow, cheaper)
+        self.stage2_batch_api = stage2_batch_api
         self.output_dir = Path("output")
         
         print("=" * 60)
@@ -62,9 +67,7 @@ class GistPipeline:
             transcript_path = ingestion.process(youtube_url)
             
             # Extract video_id from transcript
-            with open(transcript_path, 'r') as f:
-                data = json.load(f)
-                video_id = data['video_id']
+            video_id = orjson.loads(Path(transcript_path).read_bytes())['video_id']
             
             self.print_success(f"Ingestion complete: {transcript_path}")
             return transcript_path, video_id
@@ -113,7 +116,7 @@ class GistPipeline:
             provider = ProviderFactory.select_provider_with_preflight(providers, skip_preflight=False)
             
             # Initialize Brain with selected provider
-            brain = Brain(provider=provider)
+            brain = Brain(provider=provider, stage2_batch_api=self.stage2_batch_api)
             
             print(f"✅ Using provider: {provider.get_model_name()}")
             
@@ -130,7 +133,10 @@ class GistPipeline:
         
         try:
             ideas_data = brain.process(transcript_path)
-            ideas_path = brain.save_output(ideas_data)
+            if self.compact_output:
+                ideas_path = brain.save_output_compact(ideas_data)
+            else:
+                ideas_path = brain.save_output(ideas_data)
             
             # Edge case: No ideas found
             if ideas_data['ideas_count'] == 0:
@@ -249,9 +255,7 @@ class GistPipeline:
             return False
         
         # Get ideas count for summary
-        with open(ideas_path, 'r') as f:
-            ideas_data = json.load(f)
-            ideas_count = ideas_data['ideas_count']
+        ideas_count = orjson.loads(Path(ideas_path).read_bytes())['ideas_count']
         
         # Stage 3: Stitcher (optional)
         video_paths = []
@@ -294,10 +298,19 @@ Examples:
         help='Skip stitcher stage (only generate ideas JSON)'
     )
     
+    parser.add_argument(
+        '--batch-api',
+        action='store_true',
+        help='Run Brain Stage 2 through the provider Batch API (cheaper, can take hours)'
+    )
+    
     args = parser.parse_args()
     
+    # Brain reports progress through `logging`; show it as plain console output
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Run pipeline
-    pipeline = GistPipeline(mode=args.mode, skip_stitch=args.skip_stitch)
+    pipeline = GistPipeline(mode=args.mode, skip_stitch=args.skip_stitch, stage2_batch_api=args.batch_api)
     success = pipeline.run(args.url)
     
     sys.exit(0 if success else 1)
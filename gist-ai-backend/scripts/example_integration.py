@@ -10,7 +10,7 @@ This demonstrates the dual-write pattern for safe migration:
 import asyncio
 from pathlib import Path
 from api.supabase_client import VideoRepository, IdeaRepository, SegmentRepository
-from api.storage import r2_storage
+from api.storage import get_r2
 
 
 async def example_video_processing():
@@ -41,10 +41,18 @@ async def example_video_processing():
     local_transcript = Path("output/example_transcript.json")
     
     if local_video.exists():
-        # Upload to R2
-        video_url = r2_storage.upload_video(video_id, str(local_video), 'original')
-        audio_url = r2_storage.upload_video(video_id, str(local_audio), 'audio')
-        transcript_url = r2_storage.upload_video(video_id, str(local_transcript), 'transcript')
+        # Upload to R2 - the three files are independent, so upload them concurrently
+        # (off the event loop; upload_video_files fans out on the storage thread pool)
+        r2_storage = get_r2()
+        video_url, audio_url, transcript_url = await asyncio.to_thread(
+            r2_storage.upload_video_files,
+            video_id,
+            [
+                (str(local_video), 'original'),
+                (str(local_audio), 'audio'),
+                (str(local_transcript), 'transcript'),
+            ]
+        )
         
         # Save URLs to Supabase
         VideoRepository.set_video_urls(
@@ -66,15 +74,19 @@ async def example_video_processing():
     print("✓ Saved metadata")
     
     # Step 5: Continue processing stages
-    for stage, progress in [("TRANSCRIBING", 30), ("UNDERSTANDING", 50), ("GROUPING", 70), ("RANKING", 90)]:
-        VideoRepository.update_processing_state(
-            video_id,
-            status=stage,
-            current_stage=stage,
-            progress=progress
-        )
-        print(f"✓ Updated to {stage}")
-        await asyncio.sleep(0.1)  # Simulate processing time
+    # Progress writes must land in order, but nothing below depends on them,
+    # so apply them in the background while the ideas/segments are written
+    def update_stages():
+        for stage, progress in [("TRANSCRIBING", 30), ("UNDERSTANDING", 50), ("GROUPING", 70), ("RANKING", 90)]:
+            VideoRepository.update_processing_state(
+                video_id,
+                status=stage,
+                current_stage=stage,
+                progress=progress
+            )
+            print(f"✓ Updated to {stage}")
+    
+    stage_updates = asyncio.create_task(asyncio.to_thread(update_stages))
     
     # Step 6: Save ideas and segments
     idea = IdeaRepository.create_idea(
@@ -112,7 +124,8 @@ async def example_video_processing():
     SegmentRepository.bulk_create_segments(segments)
     print(f"✓ Created {len(segments)} segments")
     
-    # Step 7: Mark as complete
+    # Step 7: Mark as complete (after the stage writes, so COMPLETE is the final state)
+    await stage_updates
     VideoRepository.update_processing_state(
         video_id,
         status="COMPLETE",
@@ -9,63 +9,100 @@ Usage:
 """
 
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple
+from sqlalchemy.dialects import sqlite
 from api.models import Base, Video, Idea
 from api.database import DATABASE_URL
 
 
-def get_sqlite_columns(table_name: str, db_path: str) -> dict:
+_SQLITE_DIALECT = sqlite.dialect()
+
+
+def get_sqlite_tables(conn: sqlite3.Connection) -> set:
+    """Get the names of all tables in the SQLite database"""
+    cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def get_sqlite_columns(table_name: str, conn: sqlite3.Connection) -> dict:
     """Get actual columns from SQLite database"""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute(f"PRAGMA table_info({table_name});")
-    columns = {row[1]: row[2] for row in cursor.fetchall()}  # name: type
-    conn.close()
-    return columns
+    cursor = conn.execute(f"PRAGMA table_info({table_name});")
+    return {row[1]: row[2] for row in cursor.fetchall()}  # name: type
 
 
+# Normalized type names, checked in order against the SQLite-compiled column type
+# (substrings follow SQLite's own type-affinity rules, so BIGINT -> INTEGER, etc.)
+TYPE_MAP = (
+    ('INT', 'INTEGER'),
+    ('CHAR', 'TEXT'),
+    ('CLOB', 'TEXT'),
+    ('TEXT', 'TEXT'),
+    ('REAL', 'REAL'),
+    ('FLOA', 'REAL'),
+    ('DOUB', 'REAL'),
+    ('JSON', 'JSON'),
+)
+
+
+@lru_cache(maxsize=None)
 def get_model_columns(model_class) -> dict:
-    """Get expected columns from SQLAlchemy model"""
+    """Get expected columns from SQLAlchemy model (the schema is fixed per process)"""
     columns = {}
     for column in model_class.__table__.columns:
-        col_type = str(column.type)
-        # Normalize type names
-        if 'VARCHAR' in col_type or 'TEXT' in col_type or 'STRING' in col_type:
-            col_type = 'TEXT'
-        elif 'INTEGER' in col_type:
-            col_type = 'INTEGER'
-        elif 'FLOAT' in col_type:
-            col_type = 'REAL'
-        elif 'JSON' in col_type:
-            col_type = 'JSON'
-        columns[column.name] = col_type
+        # Compile for the SQLite dialect, i.e. exactly what CREATE TABLE would emit
+        col_type = column.type.compile(dialect=_SQLITE_DIALECT).upper()
+        columns[column.name] = next((normalized for key, normalized in TYPE_MAP if key in col_type), col_type)
     return columns
 
 
-def validate_table(model_class, db_path: str) -> tuple[bool, list[str]]:
+class TableValidation(NamedTuple):
+    """Result of checking one model's table against the database"""
+    table: str
+    exists: bool
+    missing: list  # (column, expected type) pairs absent from the database
+    extra: list    # columns in the database but not in the model
+    
+    @property
+    def valid(self) -> bool:
+        # Extra columns are a warning only
+        return self.exists and not self.missing
+    
+    def issues(self) -> list[str]:
+        """Human-readable issue lines"""
+        if not self.exists:
+            return [f"❌ Table '{self.table}' does not exist in database"]
+        return [
+            f"❌ Column '{self.table}.{col_name}' missing in database (expected {col_type})"
+            for col_name, col_type in self.missing
+        ] + [
+            f"⚠️  Column '{self.table}.{col_name}' exists in database but not in model"
+            for col_name in self.extra
+        ]
+
+
+def validate_table(model_class, conn: sqlite3.Connection, existing_tables: set) -> TableValidation:
     """Validate a single table schema"""
     table_name = model_class.__tablename__
     
-    try:
-        db_columns = get_sqlite_columns(table_name, db_path)
-    except sqlite3.OperationalError:
-        return False, [f"❌ Table '{table_name}' does not exist in database"]
-    
-    model_columns = get_model_columns(model_class)
+    # PRAGMA table_info returns no rows (not an error) for a missing table
+    if table_name not in existing_tables:
+        return TableValidation(table_name, False, [], [])
     
-    issues = []
+    db_columns = get_sqlite_columns(table_name, conn)
     
-    # Check for missing columns
-    for col_name, col_type in model_columns.items():
-        if col_name not in db_columns:
-            issues.append(f"❌ Column '{table_name}.{col_name}' missing in database (expected {col_type})")
+    model_columns = get_model_columns(model_class)
     
-    # Check for extra columns (warning only)
-    for col_name in db_columns:
-        if col_name not in model_columns:
-            issues.append(f"⚠️  Column '{table_name}.{col_name}' exists in database but not in model")
+    missing = [
+        (col_name, col_type) for col_name, col_type in model_columns.items()
+        if col_name not in db_columns
+    ]
+    extra = [col_name for col_name in db_columns if col_name not in model_columns]
     
-    return len([i for i in issues if i.startswith('❌')]) == 0, issues
+    return TableValidation(table_name, True, missing, extra)
 
 
 def validate_schema(verbose: bool = True) -> bool:
@@ -80,11 +117,34 @@ def validate_schema(verbose: bool = True) -> bool:
     all_valid = True
     all_issues = []
     
-    for model in models_to_check:
-        valid, issues = validate_table(model, db_path)
-        if not valid:
+    conn = sqlite3.connect(db_path)
+    try:
+        existing_tables = get_sqlite_tables(conn)
+    finally:
+        conn.close()
+    
+    # sqlite3 connections can't be shared across threads, so each worker
+    # opens one connection and reuses it for every model it checks
+    local = threading.local()
+    worker_conns = []
+    
+    def check(model):
+        if not hasattr(local, 'conn'):
+            local.conn = sqlite3.connect(db_path)
+            worker_conns.append(local.conn)
+        return validate_table(model, local.conn, existing_tables)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=min(8, len(models_to_check))) as executor:
+            results = list(executor.map(check, models_to_check))
+    finally:
+        for worker_conn in worker_conns:
+            worker_conn.close()
+    
+    for result in results:
+        if not result.valid:
             all_valid = False
-        all_issues.extend(issues)
+        all_issues.extend(result.issues())
     
     if verbose:
         if all_valid and not all_issues:
@@ -96,15 +156,9 @@ def validate_schema(verbose: bool = True) -> bool:
             if not all_valid:
                 print("\n❌ Schema validation FAILED - fix required")
                 print("\nTo fix missing columns, run:")
-                for issue in all_issues:
-                    if "missing in database" in issue and "expected" in issue:
-                        # Extract table.column and type
-                        parts = issue.split("'")
-                        if len(parts) >= 2:
-                            table_col = parts[1]
-                            table, col = table_col.split('.')
-                            col_type = issue.split("expected ")[1].rstrip(")")
-                            print(f"  sqlite3 {db_path} \"ALTER TABLE {table} ADD COLUMN {col} {col_type};\"")
+                for result in results:
+                    for col, col_type in result.missing:
+                        print(f"  sqlite3 {db_path} \"ALTER TABLE {result.table} ADD COLUMN {col} {col_type};\"")
     
     return all_valid
 
@@ -0,0 +1,112 @@
+"""
+Tests for Brain's streamed-JSON handling and request pacing (no network)
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from brain.brain import Brain, _JsonStreamCollector, _RequestPacer
+
+
+class ChunkedProvider:
+    """Streams a fixed list of chunks and records how many were read"""
+
+    supports_batch_api = False
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.consumed = 0
+        self.closed = False
+
+    def name(self):
+        return "Chunked"
+
+    def get_model_name(self):
+        return "fake:chunked"
+
+    async def astream(self, prompt, temperature=0.3, json_mode=False):
+        try:
+            for chunk in self.chunks:
+                self.consumed += 1
+                yield chunk
+        finally:
+            self.closed = True
+
+
+def test_collector_ignores_braces_inside_strings_and_preamble():
+    collector = _JsonStreamCollector()
+
+    assert not collector.feed('Sure, "here" it is: {"title": "use {braces}", ')
+    assert not collector.feed('"quote": "say \\"}\\"", "nested": {"a": 1}')
+    assert collector.feed('} and some trailing prose')
+
+
+def test_agenerate_stops_reading_once_the_object_closes(monkeypatch):
+    monkeypatch.setenv("BRAIN_CACHE_PATH", "")
+    provider = ChunkedProvider(['{"segments": [', '{"start": "00:10"}', ']}', ' trailing', ' never read'])
+    brain = Brain(provider=provider)
+
+    response = asyncio.run(brain.agenerate("prompt"))
+
+    assert response == '{"segments": [{"start": "00:10"}]}'
+    assert provider.consumed == 3
+    assert provider.closed
+
+
+def test_only_complete_streams_are_cached(monkeypatch, tmp_path):
+    monkeypatch.setenv("BRAIN_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    truncated = Brain(provider=ChunkedProvider(['{"segments": [', '{"start": "00:10"}']))
+    complete = Brain(provider=ChunkedProvider(['{"segments": []}']))
+
+    asyncio.run(truncated.agenerate("truncated prompt"))
+    asyncio.run(complete.agenerate("complete prompt"))
+
+    assert truncated.cache.get("fake:chunked", 0.3, "truncated prompt") is None
+    assert complete.cache.get("fake:chunked", 0.3, "complete prompt") == '{"segments": []}'
+    truncated.cache.close()
+    complete.cache.close()
+
+
+def make_brain():
+    """Brain without __init__: JSON extraction doesn't touch the provider"""
+    return Brain.__new__(Brain)
+
+
+def test_extract_json_stops_at_balanced_close_before_trailing_braces():
+    response = 'Here you go:\n{"ideas": [{"title": "a {b} c"}]}\nNote: {not json}'
+
+    assert make_brain().extract_and_parse_json(response) == {"ideas": [{"title": "a {b} c"}]}
+
+
+def test_extract_json_of_truncated_reply_raises_parse_error():
+    # One closing brace short: the scan never closes and the last-brace fallback can't parse
+    response = '{"wrapper": {"ideas": []}'
+
+    with pytest.raises(RuntimeError):
+        make_brain().extract_and_parse_json(response)
+
+
+def test_extract_json_without_object_raises():
+    with pytest.raises(ValueError):
+        make_brain().extract_and_parse_json("no json at all")
+
+
+def test_pacer_allows_burst_then_spaces_requests():
+    # 600 rpm = one request every 0.1s after a burst of 2
+    pacer = _RequestPacer(600, burst=2)
+
+    async def scenario():
+        starts = []
+        begin = time.monotonic()
+        for _ in range(4):
+            await pacer.wait()
+            starts.append(time.monotonic() - begin)
+        return starts
+
+    starts = asyncio.run(scenario())
+
+    assert starts[1] < 0.05
+    assert starts[2] >= 0.09
+    assert starts[3] >= 0.19
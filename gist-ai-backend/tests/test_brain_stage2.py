@@ -0,0 +1,164 @@
+"""
+Tests for Brain Stage 2 orchestration (scripted provider, no network)
+"""
+
+import asyncio
+
+import orjson
+
+from brain.brain import Brain
+
+
+SEGMENTS_REPLY = orjson.dumps({
+    "segments": [{"start": "00:10", "end": "00:40", "purpose": "hook"}],
+    "reasoning": "one continuous story"
+}).decode()
+
+
+class FakeProvider:
+    """LLMProvider stand-in that answers every prompt through a callback"""
+
+    supports_batch_api = False
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def name(self):
+        return "Fake"
+
+    def get_model_name(self):
+        return "fake:model"
+
+    async def astream(self, prompt, temperature=0.3, json_mode=False):
+        self.prompts.append(prompt)
+        yield self.reply(prompt)
+
+    async def aclose(self):
+        pass
+
+
+def make_brain(monkeypatch, provider, **kwargs):
+    """Brain over a scripted provider, with the persistent prompt cache off"""
+    monkeypatch.setenv("BRAIN_CACHE_PATH", "")
+    return Brain(provider=provider, **kwargs)
+
+
+def make_ideas(count):
+    return [{"title": f"Idea number {index}", "description": f"Story {index}"} for index in range(count)]
+
+
+def test_batch_api_failures_fall_back_to_realtime_calls(monkeypatch):
+    provider = FakeProvider(lambda prompt: SEGMENTS_REPLY)
+    provider.supports_batch_api = True
+    # Idea 0 succeeds in the batch, idea 1's request failed, idea 2's reply is unusable
+    provider.query_batch = lambda prompts, **kwargs: [SEGMENTS_REPLY, None, "no json here"]
+    brain = make_brain(monkeypatch, provider, stage2_batch_api=True)
+    brain.batch_stage2 = False
+
+    results = asyncio.run(brain.run_stage2_batched("[00:00] transcript", make_ideas(3)))
+
+    assert all(isinstance(result, dict) for result in results)
+    assert len(provider.prompts) == 2
+    assert "Idea number 1" in provider.prompts[0]
+    assert "Idea number 2" in provider.prompts[1]
+
+
+TRANSCRIPT = {
+    "segments": [
+        {"start": 0.0, "end": 5.0, "text": "Burnout was first described by psychologists in the 1970s."},
+        {"start": 5.0, "end": 9.0, "text": "Rest is not the same as doing nothing."},
+    ]
+}
+
+
+def test_keyword_prefilter_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("BRAIN_MIN_KEYWORD_OVERLAP", raising=False)
+    brain = make_brain(monkeypatch, FakeProvider(lambda prompt: SEGMENTS_REPLY))
+    ideas = [{"title": "Quantum chromodynamics", "description": "Gluons explained"}]
+
+    assert brain._keyword_prefilter(TRANSCRIPT, ideas) == [0]
+
+
+def test_keyword_prefilter_keeps_grounded_and_drops_ungrounded_ideas(monkeypatch):
+    monkeypatch.setenv("BRAIN_MIN_KEYWORD_OVERLAP", "1")
+    brain = make_brain(monkeypatch, FakeProvider(lambda prompt: SEGMENTS_REPLY))
+    ideas = [
+        {"title": "Where burnout came from", "description": "Psychologists named it"},
+        {"title": "Quantum chromodynamics", "description": "Gluons explained"},
+        {"title": "Why rest matters", "description": "Doing nothing versus resting"},
+    ]
+
+    assert brain._keyword_prefilter(TRANSCRIPT, ideas) == [0, 2]
+
+
+def batch_reply(results):
+    """Reply with the given batch results to the batched prompt, segments otherwise"""
+    def reply(prompt):
+        if "IDEAS TO FIND:" in prompt:
+            return orjson.dumps({"results": results}).decode()
+        return SEGMENTS_REPLY
+    return reply
+
+
+def test_batched_stage2_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("BRAIN_STAGE2_BATCHED", raising=False)
+    provider = FakeProvider(batch_reply([]))
+    brain = make_brain(monkeypatch, provider)
+
+    asyncio.run(brain.run_stage2_batched("[00:00] transcript", make_ideas(2)))
+
+    assert brain.batch_stage2 is False
+    assert not any("IDEAS TO FIND:" in prompt for prompt in provider.prompts)
+
+
+def test_partial_batch_reply_falls_back_only_for_missing_ideas(monkeypatch):
+    monkeypatch.setenv("BRAIN_STAGE2_BATCHED", "1")
+    segments = [{"start": "00:10", "end": "00:40", "purpose": "hook"}]
+    provider = FakeProvider(batch_reply([
+        {"idea_index": 2, "segments": segments, "reasoning": "third"},
+        {"idea_index": 0, "segments": segments, "reasoning": "first"},
+        # Unusable entries: missing reasoning, index out of range
+        {"idea_index": 1, "segments": segments},
+        {"idea_index": 7, "segments": segments, "reasoning": "unknown idea"},
+    ]))
+    brain = make_brain(monkeypatch, provider)
+
+    results = asyncio.run(brain.run_stage2_batched("[00:00] transcript", make_ideas(3)))
+
+    # Batch results are matched back to ideas by idea_index, not reply order
+    assert results[0]["reasoning"] == "first"
+    assert results[2]["reasoning"] == "third"
+    assert results[1]["reasoning"] == "one continuous story"
+    # One batched call, then a single per-idea call for the uncovered idea
+    assert len(provider.prompts) == 2
+    assert "Idea number 1" in provider.prompts[1]
+    assert "Idea number 0" not in provider.prompts[1]
+
+
+def test_failed_batch_call_falls_back_to_per_idea_calls(monkeypatch):
+    monkeypatch.setenv("BRAIN_STAGE2_BATCHED", "1")
+    provider = FakeProvider(lambda prompt: "truncated {" if "IDEAS TO FIND:" in prompt else SEGMENTS_REPLY)
+    brain = make_brain(monkeypatch, provider)
+
+    results = asyncio.run(brain.run_stage2_batched("[00:00] transcript", make_ideas(2)))
+
+    assert all(isinstance(result, dict) for result in results)
+    assert len(provider.prompts) == 3
+
+
+def test_failing_call_clears_the_providers_cached_preflight(monkeypatch):
+    from brain.providers import ProviderFactory
+
+    forgotten = []
+    monkeypatch.setattr(ProviderFactory, "forget_preflight", staticmethod(forgotten.append))
+
+    def reply(prompt):
+        raise ConnectionError("provider went away")
+    provider = FakeProvider(reply)
+    brain = make_brain(monkeypatch, provider)
+
+    results = asyncio.run(brain.run_stage2_batched("[00:00] transcript", make_ideas(1)))
+
+    assert isinstance(results[0], RuntimeError)
+    assert forgotten == [provider]
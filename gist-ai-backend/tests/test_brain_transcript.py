@@ -0,0 +1,55 @@
+"""
+Tests for Brain transcript formatting (no LLM provider needed)
+"""
+
+from brain.brain import Brain
+
+
+def make_brain():
+    """Brain without __init__: the formatting helpers don't touch the provider"""
+    brain = Brain.__new__(Brain)
+    brain.transcript_line_min_chars = 80
+    brain.transcript_line_max_span = 10.0
+    return brain
+
+
+def test_merge_closes_line_when_fragment_end_exceeds_max_span():
+    segments = [
+        {'start': 0.0, 'end': 4.0, 'text': 'so'},
+        {'start': 9.0, 'end': 25.0, 'text': 'this fragment runs long'},
+        {'start': 25.0, 'end': 27.0, 'text': 'and then'},
+    ]
+    
+    lines = list(make_brain()._merge_short_segments(segments, min_chars=80, max_span=10.0))
+    
+    assert [start for start, _ in lines] == [0.0, 9.0, 25.0]
+
+
+def test_merge_joins_short_fragments_within_max_span():
+    segments = [
+        {'start': 0.0, 'end': 2.0, 'text': 'short'},
+        {'start': 2.0, 'end': 4.0, 'text': 'pieces'},
+        {'start': 4.0, 'end': 6.0, 'text': 'end here.'},
+    ]
+    
+    lines = list(make_brain()._merge_short_segments(segments, min_chars=80, max_span=10.0))
+    
+    assert lines == [(0.0, 'short pieces end here.')]
+
+
+def test_formatted_anchors_match_first_fragment_start():
+    transcript = {'segments': [
+        {'start': 0.0, 'end': 3.0, 'text': 'Welcome back'},
+        {'start': 3.0, 'end': 5.5, 'text': 'to the show.'},
+        {'start': 65.4, 'end': 68.0, 'text': 'Now the'},
+        {'start': 68.0, 'end': 71.0, 'text': 'second part'},
+        {'start': 71.0, 'end': 80.0, 'text': 'runs past the span'},
+    ]}
+    
+    text = make_brain().format_transcript_for_llm(transcript)
+    
+    assert text.splitlines() == [
+        '[00:00] Welcome back to the show.',
+        '[01:05] Now the second part',
+        '[01:11] runs past the span',
+    ]
@@ -0,0 +1,70 @@
+"""
+Tests for the ProjectRepository.get_project cache (scripted Supabase client)
+"""
+
+from collections import OrderedDict
+
+from api import project_repository
+from api.project_repository import ProjectRepository
+
+
+class FakeQuery:
+    """Chainable stand-in for a Supabase select query"""
+
+    def __init__(self, client):
+        self.client = client
+        self.project_id = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.project_id = value
+        return self
+
+    def execute(self):
+        self.client.fetches.append(self.project_id)
+        row = {"id": self.project_id, "title": f"Project {self.project_id}"}
+        return type("Result", (), {"data": [row]})()
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.fetches = []
+
+    def table(self, name):
+        return FakeQuery(self)
+
+
+def use_fake_supabase(monkeypatch, max_size=1024):
+    client = FakeSupabase()
+    monkeypatch.setattr(project_repository, "get_supabase", lambda: client)
+    monkeypatch.setattr(project_repository, "_project_cache", OrderedDict())
+    monkeypatch.setattr(project_repository, "PROJECT_CACHE_MAX_SIZE", max_size)
+    return client
+
+
+def test_cached_project_is_a_copy(monkeypatch):
+    client = use_fake_supabase(monkeypatch)
+
+    first = ProjectRepository.get_project("p1")
+    first["title"] = "mutated by caller"
+    second = ProjectRepository.get_project("p1")
+
+    assert client.fetches == ["p1"]
+    assert second["title"] == "Project p1"
+    second["title"] = "mutated again"
+    assert ProjectRepository.get_project("p1")["title"] == "Project p1"
+
+
+def test_full_cache_evicts_oldest_entry_only(monkeypatch):
+    client = use_fake_supabase(monkeypatch, max_size=2)
+
+    ProjectRepository.get_project("p1")
+    ProjectRepository.get_project("p2")
+    ProjectRepository.get_project("p3")
+    ProjectRepository.get_project("p2")
+    ProjectRepository.get_project("p3")
+    ProjectRepository.get_project("p1")
+
+    assert client.fetches == ["p1", "p2", "p3", "p1"]
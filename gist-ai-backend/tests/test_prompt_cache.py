@@ -0,0 +1,78 @@
+"""
+Tests for the SQLite prompt cache
+"""
+
+from brain.prompt_cache import PromptCache
+
+
+def test_cache_is_off_unless_path_is_set(monkeypatch):
+    monkeypatch.delenv("BRAIN_CACHE_PATH", raising=False)
+    assert PromptCache.from_env() is None
+
+
+def test_cache_enabled_from_env(monkeypatch, tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    monkeypatch.setenv("BRAIN_CACHE_PATH", str(path))
+
+    cache = PromptCache.from_env()
+
+    assert cache is not None
+    assert path.exists()
+    cache.close()
+
+
+def test_closed_cache_reopens_on_next_use(tmp_path):
+    cache = PromptCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("model", 0.3, "prompt", "response")
+
+    cache.close()
+
+    assert cache.get("model", 0.3, "prompt") == "response"
+    cache.close()
+
+
+def test_get_similar_returns_match_at_or_above_threshold(tmp_path):
+    cache = PromptCache(str(tmp_path / "cache.sqlite3"))
+    namespace = cache.make_namespace("model", "transcript")
+    cache.add_similar(namespace, {"burnout", "origin", "word"}, "stored")
+
+    # 2 shared words of 3 each: cosine similarity 2/3
+    assert cache.get_similar(namespace, {"burnout", "origin", "history"}, 0.6) == "stored"
+    assert cache.get_similar(namespace, {"burnout", "origin", "word"}, 1.0) == "stored"
+    cache.close()
+
+
+def test_get_similar_misses_below_threshold_or_in_other_namespace(tmp_path):
+    cache = PromptCache(str(tmp_path / "cache.sqlite3"))
+    namespace = cache.make_namespace("model", "transcript")
+    cache.add_similar(namespace, {"burnout", "origin", "word"}, "stored")
+
+    assert cache.get_similar(namespace, {"burnout", "origin", "history"}, 0.7) is None
+    assert cache.get_similar(namespace, set(), 0.1) is None
+    other = cache.make_namespace("model", "another transcript")
+    assert cache.get_similar(other, {"burnout", "origin", "word"}, 0.5) is None
+    assert cache.make_namespace("other-model", "transcript") != namespace
+    cache.close()
+
+
+def test_get_and_set_track_hits_and_misses(tmp_path):
+    cache = PromptCache(str(tmp_path / "cache.sqlite3"))
+
+    assert cache.get("model", 0.3, "prompt") is None
+    cache.set("model", 0.3, "prompt", "response")
+    assert cache.get("model", 0.3, "prompt") == "response"
+    # Model and temperature are part of the key
+    assert cache.get("other-model", 0.3, "prompt") is None
+    assert cache.get("model", 0.7, "prompt") is None
+
+    assert cache.stats == {"hits": 1, "misses": 3}
+    cache.close()
+
+
+def test_set_replaces_existing_response(tmp_path):
+    cache = PromptCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("model", 0.3, "prompt", "first")
+    cache.set("model", 0.3, "prompt", "second")
+
+    assert cache.get("model", 0.3, "prompt") == "second"
+    cache.close()
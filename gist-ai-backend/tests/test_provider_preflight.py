@@ -0,0 +1,115 @@
+"""
+Tests for provider preflight selection (scripted providers, no network)
+"""
+
+import json
+import time
+
+from brain import providers
+from brain.providers import LLMProvider, ProviderError, ProviderFactory
+
+
+class FakeProvider(LLMProvider):
+    """Provider whose preflight answers (passes or raises) after a fixed delay"""
+
+    def __init__(self, name, delay=0.0, ok=True, preflight_timeout=5.0):
+        self._name = name
+        self.delay = delay
+        self.ok = ok
+        self.preflight_timeout = preflight_timeout
+
+    def name(self):
+        return self._name
+
+    def is_available(self):
+        return True
+
+    def preflight_check(self):
+        time.sleep(self.delay)
+        if not self.ok:
+            raise ProviderError(f"{self._name} did not answer OK")
+
+    def query(self, prompt, temperature=0.3, json_mode=False):
+        return ""
+
+    def get_model_name(self):
+        return f"fake:{self._name}"
+
+
+def record_outcomes(monkeypatch, tmp_path):
+    """Capture recorded preflight outcomes and keep caches out of $HOME"""
+    recorded = []
+    monkeypatch.setattr(providers, "PREFLIGHT_CACHE_PATH", tmp_path / "preflight.json")
+    monkeypatch.setattr(providers, "_record_preflight", lambda model, latency, ok: recorded.append((model, ok)))
+    return recorded
+
+
+def test_lower_priority_probe_still_running_is_not_recorded(monkeypatch, tmp_path):
+    recorded = record_outcomes(monkeypatch, tmp_path)
+    chain = [FakeProvider("primary"), FakeProvider("fallback", delay=0.3)]
+
+    selected = ProviderFactory.select_provider_with_preflight(chain)
+
+    assert selected is chain[0]
+    time.sleep(0.4)
+    assert recorded == [("fake:primary", True)]
+
+
+def test_probe_past_its_timeout_fails_over_to_next_provider(monkeypatch, tmp_path):
+    recorded = record_outcomes(monkeypatch, tmp_path)
+    chain = [FakeProvider("primary", delay=0.5, preflight_timeout=0.05), FakeProvider("fallback")]
+
+    selected = ProviderFactory.select_provider_with_preflight(chain)
+
+    assert selected is chain[1]
+    assert recorded == [("fake:primary", False), ("fake:fallback", True)]
+
+
+def test_failed_preflight_raises_and_next_provider_wins(monkeypatch, tmp_path):
+    recorded = record_outcomes(monkeypatch, tmp_path)
+    chain = [FakeProvider("primary", ok=False), FakeProvider("fallback")]
+
+    selected = ProviderFactory.select_provider_with_preflight(chain)
+
+    assert selected is chain[1]
+    assert recorded == [("fake:primary", False), ("fake:fallback", True)]
+
+
+def test_preflight_cache_is_off_by_default(monkeypatch):
+    monkeypatch.setattr(providers, "PREFLIGHT_CACHE_PATH", None)
+    providers._write_preflight_cache("fake:primary")
+
+    assert providers._read_preflight_cache() is None
+
+
+def test_forget_preflight_clears_only_that_providers_entry(monkeypatch, tmp_path):
+    monkeypatch.setattr(providers, "PREFLIGHT_CACHE_PATH", tmp_path / "preflight.json")
+    providers._write_preflight_cache("fake:primary")
+
+    ProviderFactory.forget_preflight(FakeProvider("fallback"))
+    assert providers._read_preflight_cache() == "fake:primary"
+
+    ProviderFactory.forget_preflight(FakeProvider("primary"))
+    assert providers._read_preflight_cache() is None
+
+
+def test_provider_stats_are_written_once_per_selection(monkeypatch, tmp_path):
+    stats_path = tmp_path / "provider_stats.json"
+    monkeypatch.setattr(providers, "PREFLIGHT_CACHE_PATH", None)
+    monkeypatch.setattr(providers, "PROVIDER_STATS_PATH", stats_path)
+    monkeypatch.setattr(providers, "_provider_stats", {})
+    writes = []
+    write_json_atomic = providers._write_json_atomic
+
+    def counting_write(path, data):
+        writes.append(path)
+        write_json_atomic(path, data)
+    monkeypatch.setattr(providers, "_write_json_atomic", counting_write)
+    chain = [FakeProvider("primary", ok=False), FakeProvider("fallback")]
+
+    ProviderFactory.select_provider_with_preflight(chain)
+
+    assert writes == [stats_path]
+    saved = json.loads(stats_path.read_text())
+    assert saved["fake:primary"]["success"] == 0.0
+    assert saved["fake:fallback"]["success"] == 1.0
@@ -0,0 +1,64 @@
+"""
+Tests for the Supabase repositories (scripted client, no network)
+"""
+
+import pytest
+from postgrest.exceptions import APIError
+
+from api import supabase_client
+from api.supabase_client import SegmentRepository
+
+
+class FakeRequest:
+    def __init__(self, client, call):
+        self.client = client
+        self.call = call
+
+    def insert(self, rows):
+        return FakeRequest(self.client, self.call + ("insert", len(rows)))
+
+    def execute(self):
+        self.client.calls.append(self.call)
+        if self.call[0] == "rpc" and self.client.rpc_error:
+            raise self.client.rpc_error
+        return type("Result", (), {"data": [{"id": "segment-1"}]})()
+
+
+class FakeSupabase:
+    def __init__(self, rpc_error=None):
+        self.rpc_error = rpc_error
+        self.calls = []
+
+    def rpc(self, name, params):
+        return FakeRequest(self, ("rpc", name))
+
+    def table(self, name):
+        return FakeRequest(self, ("table", name))
+
+
+SEGMENTS = [{"idea_id": "idea-1", "start_time": 0, "end_time": 20, "duration": 20, "sequence_order": 1}]
+
+
+def test_bulk_create_segments_uses_the_rpc(monkeypatch):
+    client = FakeSupabase()
+    monkeypatch.setattr(supabase_client, "get_supabase", lambda: client)
+
+    assert SegmentRepository.bulk_create_segments(SEGMENTS) == [{"id": "segment-1"}]
+    assert client.calls == [("rpc", "create_segments_bulk")]
+
+
+def test_bulk_create_segments_falls_back_when_function_is_missing(monkeypatch):
+    client = FakeSupabase(APIError({"code": "PGRST202", "message": "Could not find the function"}))
+    monkeypatch.setattr(supabase_client, "get_supabase", lambda: client)
+
+    assert SegmentRepository.bulk_create_segments(SEGMENTS) == [{"id": "segment-1"}]
+    assert client.calls == [("rpc", "create_segments_bulk"), ("table", "segments", "insert", 1)]
+
+
+def test_bulk_create_segments_reraises_other_errors(monkeypatch):
+    client = FakeSupabase(APIError({"code": "23503", "message": "foreign key violation"}))
+    monkeypatch.setattr(supabase_client, "get_supabase", lambda: client)
+
+    with pytest.raises(APIError):
+        SegmentRepository.bulk_create_segments(SEGMENTS)
+    assert client.calls == [("rpc", "create_segments_bulk")]
@@ -0,0 +1,66 @@
+"""
+Tests for WebSocketManager progress coalescing (fake sockets, no server)
+"""
+
+import asyncio
+
+import orjson
+
+from api.websocket_manager import PROGRESS_FLUSH_INTERVAL, WebSocketManager
+
+
+class FakeWebSocket:
+    """Records every frame sent to it"""
+
+    def __init__(self):
+        self.frames = []
+
+    async def accept(self):
+        pass
+
+    async def send_bytes(self, payload):
+        self.frames.append(orjson.loads(payload))
+
+
+async def connected_manager():
+    manager = WebSocketManager()
+    websocket = FakeWebSocket()
+    await manager.connect("video-1", websocket)
+    return manager, websocket
+
+
+def test_progress_inside_the_window_is_sent_as_one_batch_frame():
+    async def scenario():
+        manager, websocket = await connected_manager()
+        await manager.send_progress("video-1", "transcribe", 10, "starting")
+        await manager.send_progress("video-1", "analyze", 20, "reading")
+        await manager.send_progress("video-1", "transcribe", 50, "halfway")
+        await manager.send_progress("video-1", "render", 5, "queued")
+        assert websocket.frames == []
+        await asyncio.sleep(PROGRESS_FLUSH_INTERVAL * 5)
+        return websocket.frames
+
+    frames = asyncio.run(scenario())
+
+    assert len(frames) == 1
+    assert frames[0]["type"] == "batch"
+    events = frames[0]["events"]
+    # One event per stage (the latest), in the order the stages first reported
+    assert [event["stage"] for event in events] == ["transcribe", "analyze", "render"]
+    assert [event["progress"] for event in events] == [50, 20, 5]
+
+
+def test_terminal_message_flushes_pending_progress_first():
+    async def scenario():
+        manager, websocket = await connected_manager()
+        await manager.send_progress("video-1", "render", 90, "almost done")
+        await manager.send_complete("video-1", 3)
+        # The cancelled flush timer must not send the batch a second time
+        await asyncio.sleep(PROGRESS_FLUSH_INTERVAL * 5)
+        return websocket.frames
+
+    frames = asyncio.run(scenario())
+
+    assert [frame["type"] for frame in frames] == ["batch", "complete"]
+    assert frames[0]["events"][0]["progress"] == 90
+    assert frames[1]["ideas_count"] == 3
@@ -104,6 +104,9 @@ export const videoApi = {
    */
   connectWebSocket(videoId: string, onMessage: (message: any) => void): WebSocket {
     const ws = new WebSocket(`${WS_BASE_URL}/ws/videos/${videoId}`);
+    // Server sends pre-encoded UTF-8 JSON as binary frames
+    ws.binaryType = 'arraybuffer';
+    const decoder = new TextDecoder();
 
     ws.onopen = () => {
       console.log(`WebSocket connected for video ${videoId}`);
@@ -111,8 +114,14 @@ export const videoApi = {
 
     ws.onmessage = (event) => {
       try {
-        const message = JSON.parse(event.data);
-        onMessage(message);
+        const text = typeof event.data === 'string' ? event.data : decoder.decode(event.data);
+        const message = JSON.parse(text);
+        // Progress updates are coalesced server-side into batch frames
+        if (message.type === 'batch') {
+          message.events.forEach(onMessage);
+        } else {
+          onMessage(message);
+        }
       } catch (error) {
         console.error('Failed to parse WebSocket message:', error);
       }
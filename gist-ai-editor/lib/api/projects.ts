@@ -26,6 +26,17 @@ export interface Video {
   created_at: string;
 }
 
+export interface IdeaSegment {
+  id: string;
+  idea_id: string;
+  start_time: number;
+  end_time: number;
+  duration: number;
+  purpose?: string;
+  sequence_order: number;
+  created_at: string;
+}
+
 export interface Idea {
   id: string;
   video_id: string;
@@ -33,6 +44,7 @@ export interface Idea {
   description: string;
   score?: number;
   created_at: string;
+  segments: IdeaSegment[]; // ordered by sequence_order
 }
 
 export interface ProjectDetailsResponse {